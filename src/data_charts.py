@@ -89,19 +89,30 @@ def get_param_type(streamable_command: StreamableCommands):
     if streamable_command in __param_type_dict: return __param_type_dict[streamable_command]
     return None
 
+#The type of component the param of a command selects
+__param_component_dict = {
+    StreamableCommands.GetBarometerAltitudeById: "baro",
+    StreamableCommands.GetBarometerPressureById: "baro",
+    StreamableCommands.GetRawAccelVec: "accel",
+    StreamableCommands.GetCorrectedAccelVec: "accel",
+    StreamableCommands.GetNormalizedAccelVec: "accel",
+    StreamableCommands.GetRawGyroRate: "gyro",
+    StreamableCommands.GetCorrectedGyroRate: "gyro",
+    StreamableCommands.GetNormalizedGyroRate: "gyro",
+    StreamableCommands.GetRawMagVec: "mag",
+    StreamableCommands.GetCorrectedMagVec: "mag",
+    StreamableCommands.GetNormalizedMagVec: "mag",
+}
+
 def get_valid_params(streamable_command: StreamableCommands, sensor: ThreespaceDevice):
-    return get_valid_params_from_sensor(streamable_command, sensor.sensor)
+    component = __param_component_dict.get(streamable_command, None)
+    if component is None: return None
+    return getattr(sensor, f"get_available_{component}s")() #Uses the device's cached capabilities
 
 def get_valid_params_from_sensor(streamable_command: StreamableCommands, sensor: ThreespaceSensor):
-    if streamable_command in (StreamableCommands.GetBarometerAltitudeById, StreamableCommands.GetBarometerPressureById):
-        return sensor.valid_baros.copy()
-    elif streamable_command in (StreamableCommands.GetRawAccelVec, StreamableCommands.GetCorrectedAccelVec, StreamableCommands.GetNormalizedAccelVec):
-        return sensor.valid_accels.copy()
-    elif streamable_command in (StreamableCommands.GetRawGyroRate, StreamableCommands.GetCorrectedGyroRate, StreamableCommands.GetNormalizedGyroRate):
-        return sensor.valid_gyros.copy()
-    elif streamable_command in (StreamableCommands.GetRawMagVec, StreamableCommands.GetCorrectedMagVec, StreamableCommands.GetNormalizedMagVec):
-        return sensor.valid_mags.copy()
-    return None
+    component = __param_component_dict.get(streamable_command, None)
+    if component is None: return None
+    return getattr(sensor, f"valid_{component}s").copy()
 
 #--------------------------------------------------Config information specific to data charts-------------------------------------------
 
@@ -169,6 +169,23 @@ def cast_via_struct_char(value: str, format):
 
 from enum import Enum
 import numpy as np
+
+def swap_axes_array(values: np.ndarray, current_order: AxisOrder, new_order: AxisOrder, rotational: bool = False) -> np.ndarray:
+    """
+    Same as AxisOrder.swap_to, but for a whole (N, 3+) array of vectors or XYZW quaternions at once.
+    Any columns after the first 3 are copied as is. Returns a new float64 array.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    #Each new axis is a single old axis, so the whole swap is a column permutation and a sign per column
+    source = [current_order.order.index(new_order.order[i]) for i in range(3)]
+    signs = np.array([current_order.multipliers[source[i]] * new_order.multipliers[i] for i in range(3)], dtype=np.float64)
+    if rotational and current_order.is_right_handed != new_order.is_right_handed:
+        signs = -signs
+    
+    swapped = values.copy()
+    swapped[:,:3] = values[:,source] * signs
+    return swapped
+
 @dataclasses.dataclass
 class TssDataFile:
     class TimeSource(Enum):
@@ -270,6 +287,15 @@ class TssDataFile:
     def get_value(self, index, option: ThreespaceStreamingOption):
         return self.data[option][index]
 
+    def get_axis_swapped(self, option: ThreespaceStreamingOption, new_order: AxisOrder, rotational: bool = True) -> np.ndarray:
+        """
+        Returns every sample of the option converted from the file's axis order to new_order.
+        Rotational should be True for orientations and other rotational values. The stored data is not modified.
+        Files without an axis order in their settings are treated as the default XYZ order.
+        """
+        current_order = self.settings.axis_order_info or AxisOrder("XYZ")
+        return swap_axes_array(self.data[option], current_order, new_order, rotational=rotational)
+
     def get_header(self, index):
         return self.headers[index]
 
@@ -44,6 +44,7 @@ class DefaultLogGroup(LogGroup):
 
         self.file: TextIOWrapper = None
         self.file_path: pathlib.Path = None
+        self.metadata_paths: dict[LoggableDevice,pathlib.Path] = {}
 
         self.running = False
 
@@ -68,6 +69,7 @@ class DefaultLogGroup(LogGroup):
             output_folder.mkdir()
 
         #Create metadata files
+        self.metadata_paths.clear()
         for device in self.devices:
             metadata = device.get_metadata()
             if metadata is not None:
@@ -75,6 +77,7 @@ class DefaultLogGroup(LogGroup):
                 out_location = output_folder / f"{base_name}.cfg"
                 with open(out_location.resolve().as_posix(), "w") as fp:
                     fp.write(metadata)
+                self.metadata_paths[device] = out_location
 
         ext = "csv" if self.is_csv else "bin"
         self.file_path = output_folder / f"{self.name}.{ext}"
@@ -122,6 +125,17 @@ class DefaultLogGroup(LogGroup):
         self.running = False
         self.file.close()
 
+        #Some metadata, such as how many samples were dropped, is only known once done
+        for device in self.devices:
+            if device not in self.metadata_paths: continue
+            metadata = device.get_stop_metadata()
+            if metadata is None: continue
+            try:
+                with open(self.metadata_paths[device].resolve().as_posix(), "a") as fp:
+                    fp.write(f"\n{metadata}")
+            except Exception as e:
+                Logger.log_warning(f"Failed to write stop metadata for {self.name}: {e}")
+
     def mark_fatal(self):
         self.highest_error_level = ErrorLevels.FATAL
 
@@ -2,7 +2,7 @@
 Logic for logging. Contains LoggableDevices
 and Logger logic
 """
-from devices import ThreespaceDevice, ThreespaceStreamingOption, StreamableCommands, ThreespaceStreamingStatus, ThreespaceCmdResult
+from devices import ThreespaceDevice, ThreespaceStreamingOption, StreamableCommands, ThreespaceStreamingStatus, ThreespaceCmdResult, StreamingHealthMetrics
 import yostlabs.tss3.consts as threespace_consts
 from data_log.log_errors import LogError, ErrorLevel, ErrorLevels
 from utility import Logger
@@ -68,6 +68,12 @@ class LoggableDevice:
         """
         return None
 
+    def get_stop_metadata(self) -> str:
+        """
+        Return a metadata string to append to the metadata
+        file once logging has stopped, such as statistics about the log
+        """
+        return None
 
     def get_errors(self) -> list[LogError]:
         """
@@ -112,6 +118,7 @@ class ThreeSpaceLogDevice(LoggableDevice):
 
         #Validation values
         self.last_timestamp = 0 #Timestamp from the device
+        self.stream_health: StreamingHealthMetrics = None
 
     def is_data_available(self):
         return len(self.buffer) > 0
@@ -168,6 +175,8 @@ class ThreeSpaceLogDevice(LoggableDevice):
             self.device.unlock_streaming_modifications(self)
             self.device.resume_streaming(self) #Must unlock modifications to allow resuming
             self.device.lock_streaming_modifications(self)
+            self.device.reset_streaming_health()
+            self.stream_health = None
             self.last_timestamp = 0
             self.header_cached = False
             self.serial_index = None
@@ -180,6 +189,7 @@ class ThreeSpaceLogDevice(LoggableDevice):
 
     def stop(self):
         try:
+            self.stream_health = self.device.get_streaming_health()
             self.cleanup()
         except Exception as e:
             self.add_error(LogError(ErrorLevels.MINOR, f"Failed to stop device {self.device.name}"))
@@ -217,6 +227,10 @@ class ThreeSpaceLogDevice(LoggableDevice):
         setting_string += '\n'.join(f"{key}={value}" for key, value in settings.items())
         return setting_string
 
+    def get_stop_metadata(self):
+        if self.stream_health is None: return None
+        return '\n'.join(f"#stream_health {line}" for line in self.stream_health.to_summary_lines())
+
     def get_errors(self) -> list[LogError]:
         errors = self.new_errors.copy()
         self.new_errors.clear()
@@ -0,0 +1,430 @@
+"""
+Helpers that sit on top of the ThreespaceStreamingManager to make consuming
+streamed data cheaper for the suite. These are owned and exposed by ThreespaceDevice.
+"""
+from yostlabs.tss3.api import StreamableCommands
+from yostlabs.tss3.commands import threespace_command_get_info
+from yostlabs.tss3.utils.streaming import ThreespaceStreamingOption
+
+import numpy as np
+
+FLOAT_FORMATS = "fd"
+STRING_FORMATS = "sS"
+
+def get_option_dtype(option: ThreespaceStreamingOption):
+    """
+    The numpy type used to store the given option. Options that mix types or contain strings
+    are stored as objects so the values come back exactly as the API parsed them.
+    """
+    out_format = threespace_command_get_info(option.cmd.value).out_format
+    if any(c in STRING_FORMATS for c in out_format):
+        return object
+    if all(c in FLOAT_FORMATS for c in out_format):
+        return np.float64
+    if any(c in FLOAT_FORMATS for c in out_format):
+        return object
+    if 'U' in out_format:
+        return np.uint64
+    return np.int64
+
+class StreamingSnapshot:
+    """
+    All samples received within a range, stored as one array per streaming option.
+    Each array has a row per sample. Single value options are stored as a 1D array,
+    everything else as (num_samples, num_values).
+    The arrays may be views into the streaming buffer, so copy them if keeping them past the current update.
+    """
+
+    def __init__(self, columns: dict[ThreespaceStreamingOption, np.ndarray], header_timestamps: np.ndarray, start_index: int, num_samples: int, dropped: int = 0):
+        self.columns = columns
+        self.header_timestamps = header_timestamps
+        self.start_index = start_index #The sample index of the first row
+        self.num_samples = num_samples
+        self.dropped = dropped #How many samples were overwritten before they could be read
+
+    def __len__(self):
+        return self.num_samples
+
+    def __contains__(self, option: ThreespaceStreamingOption):
+        return option in self.columns
+
+    def get(self, command: StreamableCommands|ThreespaceStreamingOption, param=None) -> np.ndarray|None:
+        if not isinstance(command, tuple):
+            command = ThreespaceStreamingOption(command, param)
+        return self.columns.get(command, None)
+
+    @property
+    def timestamps(self) -> np.ndarray|None:
+        """
+        The timestamp column. Uses the streamed GetTimestamp if available, otherwise
+        the header timestamp. None if neither is available.
+        """
+        timestamps = self.get(StreamableCommands.GetTimestamp)
+        if timestamps is not None:
+            return timestamps
+        return self.header_timestamps
+
+    @property
+    def end_index(self):
+        return self.start_index + self.num_samples
+
+class StreamingColumnBuffer:
+    """
+    Circular buffer that stores each streamed sample into preallocated numpy columns
+    so consumers can handle all samples since they last read in a single step.
+    """
+
+    DEFAULT_CAPACITY = 4096
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.layout: tuple[ThreespaceStreamingOption] = ()
+        self.columns: dict[ThreespaceStreamingOption, np.ndarray] = {}
+        self.header_timestamps = np.zeros(capacity, dtype=np.uint64)
+        self.has_header_timestamps = False
+
+        self.sample_count = 0 #Total samples ever added. Also the index of the next sample
+        self.layout_start = 0 #Index of the first sample using the current layout
+
+    def reset(self):
+        self.layout = ()
+        self.columns = {}
+        self.layout_start = self.sample_count
+
+    def set_layout(self, layout: tuple[ThreespaceStreamingOption]):
+        if layout == self.layout: return
+        #Samples from a different layout can't be stored in the same columns, so the history is dropped
+        self.layout = layout
+        self.layout_start = self.sample_count
+        self.columns = {}
+        for option in layout:
+            num_out = threespace_command_get_info(option.cmd.value).num_out_params
+            shape = (self.capacity,) if num_out == 1 else (self.capacity, num_out)
+            self.columns[option] = np.zeros(shape, dtype=get_option_dtype(option))
+
+    def add(self, data: list, header_timestamp: int = None):
+        index = self.sample_count % self.capacity
+        for option, value in zip(self.layout, data):
+            self.columns[option][index] = value
+        self.has_header_timestamps = header_timestamp is not None
+        if self.has_header_timestamps:
+            self.header_timestamps[index] = header_timestamp
+        self.sample_count += 1
+
+    def read(self, start_index: int) -> StreamingSnapshot:
+        """
+        Get every sample from start_index to the newest sample. If start_index is older then
+        what the buffer still holds, only the retained samples are returned.
+        """
+        oldest = max(self.layout_start, self.sample_count - self.capacity)
+        dropped = 0
+        if start_index < oldest:
+            #Only count samples as dropped if they were from the current layout
+            dropped = max(0, oldest - max(start_index, self.layout_start))
+            start_index = oldest
+        num_samples = max(0, self.sample_count - start_index)
+
+        #Build the indices for the range, unwrapping if required. Slicing avoids a copy when not wrapped.
+        first = start_index % self.capacity
+        if first + num_samples <= self.capacity:
+            indices = slice(first, first + num_samples)
+        else:
+            indices = np.arange(first, first + num_samples) % self.capacity
+
+        columns = { option: column[indices] for option, column in self.columns.items() }
+        header_timestamps = self.header_timestamps[indices] if self.has_header_timestamps else None
+        return StreamingSnapshot(columns, header_timestamps, start_index, num_samples, dropped)
+
+class StreamingReader:
+    """
+    A consumers view of a StreamingColumnBuffer. Each poll returns everything
+    received since the previous poll.
+    """
+
+    def __init__(self, buffer: StreamingColumnBuffer):
+        self.buffer = buffer
+        self.next_index = buffer.sample_count
+
+    def poll(self) -> StreamingSnapshot:
+        snapshot = self.buffer.read(self.next_index)
+        self.next_index = snapshot.end_index
+        return snapshot
+
+    def skip(self):
+        """Ignore anything received up to this point"""
+        self.next_index = self.buffer.sample_count
+
+def unwrap_timestamps(timestamps: np.ndarray, last_timestamp: int|None, offset: int):
+    """
+    Vectorized version of the timestamp wrap handling used by the live charts.
+    Returns the unwrapped timestamps as float64, the last raw timestamp, and the new offset.
+    """
+    if len(timestamps) == 0:
+        return np.zeros(0, dtype=np.float64), last_timestamp, offset
+    raw = timestamps.astype(np.float64)
+    previous = np.empty_like(raw)
+    previous[1:] = raw[:-1]
+    previous[0] = raw[0] if last_timestamp is None else last_timestamp
+
+    #Wraps are U32 unless the previous timestamp was already past the U32 range
+    wrapped = raw < previous
+    wrap_sizes = np.where(previous < 0xFFFFFFFF, float(0xFFFFFFFF), float(0xFFFFFFFFFFFFFFFF))
+    offsets = np.cumsum(np.where(wrapped, wrap_sizes, 0)) + offset
+    return raw + offsets, int(timestamps[-1]), float(offsets[-1])
+
+from dataclasses import dataclass, field
+import time
+
+@dataclass
+class StreamingHealthMetrics:
+    received: int = 0
+    expected: int = 0
+
+    interval: int = None #Microseconds
+    duration: float = 0 #Seconds
+    timestamp_source: str = None
+
+    num_gaps: int = 0
+    missing_from_gaps: int = 0
+    largest_gap: int = 0 #Microseconds
+
+    #Counts of how far each sample period was from the expected interval, as a fraction of the interval
+    jitter_bin_edges: tuple[float] = ()
+    jitter_histogram: list[int] = field(default_factory=list)
+
+    checksum_failures: int = 0
+    resyncs: int = 0
+
+    @property
+    def dropped(self):
+        return max(0, self.expected - self.received)
+    
+    @property
+    def drop_percent(self):
+        if self.expected == 0: return 0
+        return 100 * self.dropped / self.expected
+
+    def get_jitter_labels(self):
+        edges = self.jitter_bin_edges
+        labels = [f"{edges[i]*100:g}-{edges[i+1]*100:g}%" for i in range(len(edges)-1)]
+        labels.append(f"{edges[-1]*100:g}%+")
+        return labels
+
+    def to_summary_lines(self):
+        lines = [
+            f"received={self.received}",
+            f"expected={self.expected}",
+            f"dropped={self.dropped} ({self.drop_percent:.2f}%)",
+            f"duration={self.duration:.3f}s",
+            f"interval={self.interval}us",
+            f"timestamp_source={self.timestamp_source}",
+            f"gaps={self.num_gaps} missing={self.missing_from_gaps} largest={self.largest_gap}us",
+            f"checksum_failures={self.checksum_failures}",
+            f"resyncs={self.resyncs}",
+            "jitter=" + ' '.join(f"{label}:{count}" for label, count in zip(self.get_jitter_labels(), self.jitter_histogram))
+        ]
+        return lines
+
+class StreamingHealthTracker:
+    """
+    Tracks how well a stream is being received, such as dropped samples, gaps and jitter,
+    using the stream timestamps when available. The expected number of samples is based on the
+    streaming interval, with each change in interval or pause starting a new segment.
+    """
+
+    JITTER_BIN_EDGES = (0, 0.01, 0.05, 0.1, 0.25, 0.5, 1)
+    GAP_THRESHOLD = 1.5 #Multiple of the interval before a delta is considered a gap
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.received = 0
+        self.closed_expected = 0 #Expected samples from previous segments
+        self.checksum_failures = 0
+        self.resyncs = 0
+        self.num_gaps = 0
+        self.missing_from_gaps = 0
+        self.largest_gap = 0
+        self.jitter_histogram = np.zeros(len(self.JITTER_BIN_EDGES), dtype=np.int64)
+        self.timestamp_source = None
+        self.duration = 0
+
+        self.interval = None
+        self.__start_segment()
+
+    def __start_segment(self):
+        self.segment_received = 0
+        self.segment_first_timestamp = None
+        self.segment_last_timestamp = None
+        self.segment_start_time = None
+        self.segment_last_time = None
+
+    def __segment_expected(self):
+        if self.segment_received == 0 or self.interval is None: return 0
+        if self.segment_first_timestamp is not None:
+            elapsed = self.segment_last_timestamp - self.segment_first_timestamp
+        else: #No timestamps, go off when samples actually arrived
+            elapsed = (self.segment_last_time - self.segment_start_time) * 1_000_000
+        return max(round(elapsed / self.interval) + 1, self.segment_received)
+
+    def end_segment(self):
+        """Call when there is an expected break in the data, such as pausing or changing speed"""
+        self.closed_expected += self.__segment_expected()
+        if self.segment_last_time is not None:
+            self.duration += self.segment_last_time - self.segment_start_time
+        self.__start_segment()
+
+    def set_interval(self, interval: int):
+        if interval == self.interval: return
+        self.end_segment()
+        self.interval = interval
+
+    def add_checksum_failure(self):
+        self.checksum_failures += 1
+
+    def add_resync(self):
+        self.resyncs += 1
+
+    def process(self, num_samples: int, timestamps: np.ndarray = None, timestamp_source: str = None):
+        if num_samples == 0: return
+        cur_time = time.perf_counter()
+        if self.segment_start_time is None:
+            self.segment_start_time = cur_time
+        self.segment_last_time = cur_time
+        self.received += num_samples
+        self.timestamp_source = timestamp_source
+
+        if timestamps is None or len(timestamps) == 0 or self.interval is None:
+            self.segment_received += num_samples
+            return
+        
+        #The timestamp going backwards means it was reset or wrapped, which starts a new segment
+        timestamps = timestamps.astype(np.int64)
+        restarts = np.flatnonzero(np.diff(timestamps) < 0) + 1
+        if self.segment_last_timestamp is not None and timestamps[0] < self.segment_last_timestamp:
+            restarts = np.insert(restarts, 0, 0)
+        for i, chunk in enumerate(np.split(timestamps, restarts)):
+            if len(chunk) == 0: continue
+            if i > 0:
+                self.end_segment()
+                self.segment_start_time = self.segment_last_time = cur_time
+            if self.segment_last_timestamp is None:
+                self.segment_first_timestamp = int(chunk[0])
+                self.__process_deltas(np.diff(chunk))
+            else:
+                self.__process_deltas(np.diff(chunk, prepend=self.segment_last_timestamp))
+            self.segment_last_timestamp = int(chunk[-1])
+            self.segment_received += len(chunk)
+
+    def __process_deltas(self, deltas: np.ndarray):
+        if len(deltas) == 0: return
+        gaps = deltas > self.interval * self.GAP_THRESHOLD
+        if np.any(gaps):
+            gap_sizes = deltas[gaps]
+            self.num_gaps += len(gap_sizes)
+            self.missing_from_gaps += int(np.sum(np.round(gap_sizes / self.interval) - 1))
+            self.largest_gap = max(self.largest_gap, int(np.max(gap_sizes)))
+        
+        deviation = np.abs(deltas - self.interval) / self.interval
+        bins = np.searchsorted(self.JITTER_BIN_EDGES, deviation, side="right") - 1
+        self.jitter_histogram += np.bincount(bins, minlength=len(self.JITTER_BIN_EDGES))
+
+    def get_metrics(self) -> StreamingHealthMetrics:
+        duration = self.duration
+        if self.segment_last_time is not None:
+            duration += self.segment_last_time - self.segment_start_time
+        return StreamingHealthMetrics(
+            received=self.received,
+            expected=self.closed_expected + self.__segment_expected(),
+            interval=self.interval,
+            duration=duration,
+            timestamp_source=self.timestamp_source,
+            num_gaps=self.num_gaps,
+            missing_from_gaps=self.missing_from_gaps,
+            largest_gap=self.largest_gap,
+            jitter_bin_edges=self.JITTER_BIN_EDGES,
+            jitter_histogram=self.jitter_histogram.tolist(),
+            checksum_failures=self.checksum_failures,
+            resyncs=self.resyncs
+        )
+
+from yostlabs.tss3.utils.streaming import ThreespaceStreamingManager, ThreespaceStreamingStatus
+from typing import Callable, Any
+
+class StreamingMultiplexer:
+    """
+    Sits in front of the streaming manager and groups callbacks that registered with the same
+    rate into a single manager callback. The manager then only dispatches once per rate instead of once
+    per consumer, and consumers that only care about the end of each batch are never called per sample.
+    Since the streaming speed is determined by the registered rates, this does not change the speed.
+    """
+
+    @dataclass
+    class Member:
+        func: Callable[[ThreespaceStreamingStatus,Any],None]
+        user_data: Any = None
+        batch_only: bool = False
+
+    class Bucket:
+
+        def __init__(self):
+            self.members: dict[Callable,StreamingMultiplexer.Member] = {}
+            self.per_sample: list[StreamingMultiplexer.Member] = []
+
+        def rebuild(self):
+            self.per_sample = [member for member in self.members.values() if not member.batch_only]
+
+        def dispatch(self, status: ThreespaceStreamingStatus):
+            if status == ThreespaceStreamingStatus.Data:
+                members = self.per_sample
+            else:
+                members = list(self.members.values()) #Copy since members are expected to unregister on Reset
+            for member in members:
+                member.func(status, member.user_data)
+
+    def __init__(self, streaming_manager: ThreespaceStreamingManager):
+        self.streaming_manager = streaming_manager
+        self.buckets: dict[tuple[int,bool],StreamingMultiplexer.Bucket] = {}
+        self.callback_buckets: dict[Callable,tuple[int,bool]] = {}
+
+    def register_callback(self, callback: Callable, hz=None, only_newest=False, user_data=None, batch_only=False):
+        """
+        batch_only callbacks are only notified once per batch (DataEnd), not on each individual Data update.
+        They are still notified of Paused, Resumed, and Reset.
+        """
+        if callback in self.callback_buckets: return
+        key = (hz, only_newest)
+        bucket = self.buckets.get(key, None)
+        is_new_bucket = bucket is None
+        if is_new_bucket:
+            bucket = StreamingMultiplexer.Bucket()
+            self.buckets[key] = bucket
+        bucket.members[callback] = StreamingMultiplexer.Member(self.__get_compatible_func(callback), user_data, batch_only)
+        bucket.rebuild()
+        self.callback_buckets[callback] = key
+        if is_new_bucket:
+            self.streaming_manager.register_callback(bucket.dispatch, hz=hz, only_newest=only_newest)
+
+    def unregister_callback(self, callback: Callable):
+        key = self.callback_buckets.pop(callback, None)
+        if key is None: return
+        bucket = self.buckets[key]
+        del bucket.members[callback]
+        bucket.rebuild()
+        if len(bucket.members) == 0:
+            del self.buckets[key]
+            self.streaming_manager.unregister_callback(bucket.dispatch)
+
+    @property
+    def num_callbacks_registered(self):
+        return len(self.callback_buckets)
+
+    @staticmethod
+    def __get_compatible_func(func: Callable):
+        #Same signature handling as the streaming manager, the user_data is optional
+        arg_count = func.__code__.co_argcount
+        if hasattr(func, "__self__"): arg_count -= 1
+        if arg_count == 1:
+            return lambda status, user_data: func(status)
+        return func
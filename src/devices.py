@@ -9,6 +9,8 @@ Also has some abstract devices, such as LoggerDevice
 from yostlabs.tss3 import ThreespaceHardwareVersion, ThreespaceSensor, StreamableCommands, \
     ThreespaceHeaderInfo, ThreespaceCmdResult
 from yostlabs.tss3.commands import threespace_command_get_by_name, ThreespaceCommandInfo, threespace_command_get_info
+from yostlabs.tss3.settings import threespace_setting_get
+from yostlabs.tss3.consts import THREESPACE_MAX_CMD_LEN
 from yostlabs.communication.serial import ThreespaceSerialComClass, ThreespaceComClass
 from yostlabs.communication.ble import ThreespaceBLEComClass
 from yostlabs.communication.bluetooth import ThreespaceBluetoothComClass
@@ -19,14 +21,145 @@ from yostlabs.math.axes import AxisOrder
 from utility import Logger, Callback
 import yostlabs.tss3.consts as threespace_consts
 from gui.resources.obj_lib import ObjectLibrary, OBJ
+from device_streaming import StreamingColumnBuffer, StreamingReader, StreamingSnapshot, StreamingHealthTracker, StreamingHealthMetrics, \
+    StreamingMultiplexer
 
 import platform
+import numpy as np
 from typing import Callable, Any
+from dataclasses import dataclass, field
+from enum import Enum
 
 import time
 
 import traceback
 
+@dataclass
+class ThreespaceCapabilities:
+    """
+    Snapshot of what a sensor supports. None of this can change without a settings
+    reload, restart, or firmware change, so it is read once instead of on every request.
+    """
+    components: list[str] = field(default_factory=list)
+    streamable_commands: list[StreamableCommands] = field(default_factory=list)
+
+    mags: list[int] = field(default_factory=list)
+    accels: list[int] = field(default_factory=list)
+    gyros: list[int] = field(default_factory=list)
+    baros: list[int] = field(default_factory=list)
+
+    #Filled in lazily since only the calibration wizards care about them
+    odrs: dict[str,int] = field(default_factory=dict)
+
+class ThreespaceSettingsTransaction:
+    """
+    Collects setting writes and sends them using as few write_settings calls as the
+    command length allows. Results are reported per key, 0 meaning success.
+
+    Keys are sent in the order they were set. This assumes the sensor applies the keys of a write
+    in order and stops at the first one that fails, so the keys after a failure are retried in the next write.
+    Keys that reset or restart the sensor are always sent in their own write, so the keys around them
+    are not applied to or retried against a sensor that just changed state.
+    """
+
+    #Error reported for keys that could not be sent at all (Unknown key, bad value, timeout...)
+    ERR_NOT_SENT = -256
+
+    #Keys that change the state of the sensor as they are applied
+    ISOLATED_KEYS = ("default", "reboot", "fs_cfg_load", "debug_mode")
+
+    #Notified with (sensor, keys) before each write, so devices can drop anything they cached for those keys
+    on_write = Callback()
+
+    def __init__(self, sensor: ThreespaceSensor):
+        self.sensor = sensor
+        self.pending: dict[str,Any] = {}
+        self.results: dict[str,int] = {}
+        self.num_writes = 0
+
+    def set(self, key: str, value: Any):
+        self.pending[key] = value
+
+    def update(self, **kwargs):
+        self.pending.update(kwargs)
+
+    def commit(self) -> dict[str,int]:
+        #Compute the size of each key up front so the batches can be built without exceeding the max command length
+        items = []
+        for key, value in self.pending.items():
+            size = self.__get_encoded_size(key, value)
+            if size is None:
+                self.results[key] = self.ERR_NOT_SENT
+            else:
+                items.append((key, value, size))
+        self.pending.clear()
+
+        while len(items) > 0:
+            batch, items = self.__take_batch(items)
+            self.num_writes += 1
+            ThreespaceSettingsTransaction.on_write._notify(self.sensor, [key for key, _, _ in batch])
+            try:
+                err, num_successes = self.sensor.write_settings(**{key: value for key, value, _ in batch})
+            except Exception:
+                for key, _, _ in batch:
+                    self.results[key] = self.ERR_NOT_SENT
+                continue
+            
+            for key, _, _ in batch[:num_successes]:
+                self.results[key] = 0
+            if not err: continue
+
+            #Keys are applied in order and the sensor stops at the first failure, so retry everything after it
+            failed_index = min(num_successes, len(batch) - 1)
+            self.results[batch[failed_index][0]] = err
+            items = batch[failed_index+1:] + items
+
+        return self.results
+
+    @property
+    def all_success(self):
+        return all(err == 0 for err in self.results.values())
+
+    @staticmethod
+    def __take_batch(items: list[tuple[str,Any,int]]):
+        if items[0][0] in ThreespaceSettingsTransaction.ISOLATED_KEYS:
+            return items[:1], items[1:]
+        #Start byte + checksum. The ';' seperators become the null terminator on the last key.
+        length = 2
+        for i, (key, value, size) in enumerate(items):
+            length += size
+            if (length > THREESPACE_MAX_CMD_LEN or key in ThreespaceSettingsTransaction.ISOLATED_KEYS) and i > 0:
+                return items[:i], items[i:]
+        return items, []
+
+    @staticmethod
+    def __get_encoded_size(key: str, value: Any):
+        """
+        Mirrors how write_settings encodes a key/value pair. Returns None if the pair can't be written.
+        """
+        setting = threespace_setting_get(key)
+        if setting is None or setting.in_format is None:
+            return None
+        
+        if isinstance(value, bool):
+            value = int(value)
+        elif hasattr(value, '__iter__') and not isinstance(value, (str, bytes, bytearray)):
+            if all(isinstance(v, Enum) for v in value):
+                value = ','.join(str(v.value) for v in value)
+            elif setting.in_format.num_params == 1 and setting.in_format.internal_format.lower()[0] == 's':
+                value = ','.join(str(v) for v in value)
+        
+        try:
+            if hasattr(value, '__iter__') and not isinstance(value, (str, bytes, bytearray)):
+                value_bytes = setting.in_format.format_data(*value)
+            else:
+                value_bytes = setting.in_format.format_data(value)
+        except Exception:
+            return None
+        
+        #Key, null terminator, value, seperator
+        return len(key) + 1 + len(value_bytes) + 1
+
 class ThreespaceDevice:
     """
     All threespace sensor interaction is done through this class.
@@ -41,6 +174,9 @@ class ThreespaceDevice:
     DEFAULT_BIAS = [0, 0, 0]
     DEFAULT_MATRIX = [1, 0, 0, 0, 1, 0, 0, 0, 1]
 
+    #Setting keys that can change every ODR
+    ODR_RESET_KEYS = ("default", "fs_cfg_load")
+
     def __init__(self, com: ThreespaceComClass):
         self.com = com
         if isinstance(com, ThreespaceSerialComClass):
@@ -80,10 +216,25 @@ class ThreespaceDevice:
         #Don't be opened by default
         self.__api = None
         self.streaming_manager: ThreespaceStreamingManager = None
+        self.streaming_multiplexer: StreamingMultiplexer = None
+
+        #Columnar copy of the streamed data. Only filled while something is reading from it
+        self.__stream_columns = StreamingColumnBuffer()
+        self.__stream_readers: set[StreamingReader] = set()
+        self.__stream_layout_dirty = True
+
+        #Always tracked while streaming so logs and the health panel can report drops/jitter
+        self.streaming_health = StreamingHealthTracker()
+        self.__stream_health_registered = False
+        self.__stream_health_timestamps: list[int] = []
+        self.__stream_health_source = None
+        self.__stream_health_layout = None
+        self.__was_misaligned = False
 
         #These will be loaded when initially opened
         self.cached_serial_number = None
         self.cached_axis_order = None
+        self.__capabilities: ThreespaceCapabilities = None
 
     @property
     def sensor(self):
@@ -139,10 +290,14 @@ class ThreespaceDevice:
             raise e
         if self.__api.in_bootloader: 
             return
+        ThreespaceSettingsTransaction.on_write.subscribe(self.__on_transaction_write)
+        self.__hook_api_parsing()
         self.streaming_manager = ThreespaceStreamingManager(self.__api)
         self.streaming_manager.enable()
+        self.streaming_multiplexer = StreamingMultiplexer(self.streaming_manager)
         self.cached_serial_number = self.get_serial_number()
         self.cache_axis_order()
+        self.cache_capabilities()
 
     def close(self):
         if not self.is_open: return
@@ -150,7 +305,9 @@ class ThreespaceDevice:
             self.__api.cleanup()
         except Exception as e:
             self.report_error(e)
+        ThreespaceSettingsTransaction.on_write.unsubscribe(self.__on_transaction_write)
         self.__api = None
+        self.__capabilities = None
 
     def disconnect(self):
         self.on_disconnect._notify(self)
@@ -168,7 +325,11 @@ class ThreespaceDevice:
 
         if self.streaming_manager is None: return
         try:
+            if not self.__stream_health_registered and self.streaming_manager.is_streaming:
+                self.streaming_manager.register_callback(self.__on_streaming_health_update)
+                self.__stream_health_registered = True
             self.streaming_manager.update()
+            self.__observe_misaligned()
         except Exception as e:
             self.report_error(e)
 
@@ -191,11 +352,15 @@ class ThreespaceDevice:
     def resume_streaming(self, lock: object):
         return self.streaming_manager.resume(lock)
 
-    def register_streaming_callback(self, callback: Callable[[ThreespaceStreamingStatus,Any],None], hz=None, only_newest=False, user_data=None):
-        self.streaming_manager.register_callback(callback, hz=hz, only_newest=only_newest, user_data=user_data)
+    def register_streaming_callback(self, callback: Callable[[ThreespaceStreamingStatus,Any],None], hz=None, only_newest=False, user_data=None, batch_only=False):
+        """
+        Callbacks registered at the same rate share a single streaming manager callback.
+        Set batch_only if the callback only uses DataEnd to skip being called for every sample.
+        """
+        self.streaming_multiplexer.register_callback(callback, hz=hz, only_newest=only_newest, user_data=user_data, batch_only=batch_only)
     
     def unregister_streaming_callback(self, callback: Callback):
-        return self.streaming_manager.unregister_callback(callback)
+        return self.streaming_multiplexer.unregister_callback(callback)
         
     def register_streaming_command(self, owner: object, command: StreamableCommands|ThreespaceStreamingOption, param=None, immediate_update=True):
         return self.streaming_manager.register_command(owner, command, param=param, immediate_update=immediate_update)
@@ -236,10 +401,126 @@ class ThreespaceDevice:
     def get_streaming_interval(self):
         return self.streaming_manager.interval
 
+    def open_streaming_reader(self) -> StreamingReader:
+        """
+        Get a reader that returns all streaming samples received since it was last polled
+        as numpy columns. Should be polled on DataEnd and closed with close_streaming_reader when done.
+        The reader is invalidated if the streaming manager is reset.
+        """
+        if len(self.__stream_readers) == 0:
+            self.__stream_layout_dirty = True
+            self.streaming_manager.register_callback(self.__on_streaming_columns_update)
+        reader = StreamingReader(self.__stream_columns)
+        self.__stream_readers.add(reader)
+        return reader
+    
+    def close_streaming_reader(self, reader: StreamingReader):
+        if reader not in self.__stream_readers: return
+        self.__stream_readers.remove(reader)
+        if len(self.__stream_readers) == 0:
+            self.streaming_manager.unregister_callback(self.__on_streaming_columns_update)
+
+    def __on_streaming_columns_update(self, status: ThreespaceStreamingStatus):
+        if status == ThreespaceStreamingStatus.Data:
+            #The slots can only change between updates, so only need to check the layout once per batch
+            if self.__stream_layout_dirty:
+                layout = tuple(ThreespaceStreamingOption(slot.cmd, slot.param) for slot in self.streaming_manager.slots if slot.active)
+                self.__stream_columns.set_layout(layout)
+                self.__stream_layout_dirty = False
+            response = self.streaming_manager.get_last_response()
+            self.__stream_columns.add(response.data, response.header.timestamp)
+        elif status == ThreespaceStreamingStatus.DataEnd:
+            self.__stream_layout_dirty = True
+        elif status == ThreespaceStreamingStatus.Reset:
+            self.__stream_readers.clear()
+            self.__stream_columns.reset()
+            self.streaming_manager.unregister_callback(self.__on_streaming_columns_update)
+
+    def __on_streaming_health_update(self, status: ThreespaceStreamingStatus):
+        if status == ThreespaceStreamingStatus.Data:
+            if len(self.__stream_health_timestamps) == 0:
+                #Any change to the slots or interval restarts streaming, so the time in between shouldn't count as dropped
+                layout = (self.streaming_manager.interval, tuple((slot.cmd, slot.param) for slot in self.streaming_manager.slots if slot.active))
+                if layout != self.__stream_health_layout:
+                    self.streaming_health.end_segment()
+                    self.streaming_health.set_interval(self.streaming_manager.interval)
+                    self.__stream_health_layout = layout
+                response = self.streaming_manager.get_last_response()
+                if response.header.timestamp is not None:
+                    self.__stream_health_source = "header"
+                elif self.streaming_manager.get_value(StreamableCommands.GetTimestamp) is not None:
+                    self.__stream_health_source = "GetTimestamp"
+                else:
+                    self.__stream_health_source = None
+            
+            if self.__stream_health_source == "header":
+                self.__stream_health_timestamps.append(self.streaming_manager.get_last_response().header.timestamp)
+            elif self.__stream_health_source == "GetTimestamp":
+                self.__stream_health_timestamps.append(self.streaming_manager.get_value(StreamableCommands.GetTimestamp))
+            else:
+                self.__stream_health_timestamps.append(None)
+        elif status == ThreespaceStreamingStatus.DataEnd:
+            timestamps = None
+            if self.__stream_health_source is not None: #A sample may be missing its timestamp
+                timestamps = np.array([t for t in self.__stream_health_timestamps if t is not None], dtype=np.uint64)
+            self.streaming_health.process(len(self.__stream_health_timestamps), timestamps, self.__stream_health_source)
+            self.__stream_health_timestamps.clear()
+        elif status == ThreespaceStreamingStatus.Paused:
+            self.streaming_health.end_segment()
+        elif status == ThreespaceStreamingStatus.Reset:
+            self.streaming_health.end_segment()
+            self.__stream_health_timestamps.clear()
+            self.__stream_health_layout = None
+            self.streaming_manager.unregister_callback(self.__on_streaming_health_update)
+            self.__stream_health_registered = False
+
+    def __hook_api_parsing(self):
+        #The API has no counters for packets that fail verification or for realigning the stream, so hook the
+        #private methods it parses responses with. Checksum failures are counted the same as the API logs them,
+        #only while aligned, since scanning for the next response while misaligned fails the check constantly.
+        #The API sets and clears misaligned between these calls, so resyncs are counted when it is seen changing to True.
+        api = self.__api
+        api_peek_checksum = api._ThreespaceSensor__peek_checksum
+        api_handle_misalignment = api._ThreespaceSensor__handle_misalignment
+
+        def peek_checksum(*args, **kwargs):
+            self.__observe_misaligned()
+            aligned = not api.misaligned
+            result = api_peek_checksum(*args, **kwargs)
+            if not result and aligned:
+                self.streaming_health.add_checksum_failure()
+            return result
+
+        def handle_misalignment(*args, **kwargs):
+            self.__observe_misaligned()
+            api_handle_misalignment(*args, **kwargs)
+            self.__observe_misaligned()
+
+        api._ThreespaceSensor__peek_checksum = peek_checksum
+        api._ThreespaceSensor__handle_misalignment = handle_misalignment
+
+    def __observe_misaligned(self):
+        misaligned = self.__api.misaligned
+        if misaligned and not self.__was_misaligned:
+            self.streaming_health.add_resync()
+        self.__was_misaligned = misaligned
+
+    def get_streaming_health(self) -> StreamingHealthMetrics:
+        return self.streaming_health.get_metrics()
+
+    def reset_streaming_health(self):
+        self.streaming_health.reset()
+        self.__stream_health_layout = None
+
     def is_api_streaming(self):
         if not self.is_open: return False
         return self.__api.is_streaming is True
 
+    def get_streaming_period_s(self) -> float|None:
+        """Seconds between streamed samples, or None if not streaming. See get_streaming_interval for microseconds"""
+        if not self.is_api_streaming() or self.streaming_manager is None: return None
+        return self.streaming_manager.interval / 1_000_000
+
     def get_streaming_batch(self):
         return self.__api.getStreamingBatch()
 
@@ -309,9 +590,23 @@ class ThreespaceDevice:
         self.__api.write_settings(pts_auto_declination=0, pts_mag_declination=0)
 
     def set_settings(self, **kwargs):
+        self.__invalidate_cached_odrs(kwargs.keys())
         self.__api.write_settings(**kwargs)
 
+    def create_settings_transaction(self):
+        return ThreespaceSettingsTransaction(self.__api)
+    
+    def set_settings_batched(self, **kwargs) -> dict[str,int]:
+        """
+        Same as set_settings, but will split into multiple writes if needed
+        and returns the error code for each individual key.
+        """
+        transaction = self.create_settings_transaction()
+        transaction.update(**kwargs)
+        return transaction.commit()
+
     def restore_factory_settings(self):
+        self.invalidate_capabilities()
         self.__api.restoreDefaultSettings()
 
     def commit_settings(self):
@@ -321,6 +616,7 @@ class ThreespaceDevice:
 
     def restart_sensor(self):
         self.streaming_manager.reset() #Disable anything relying on streaming since sensor must reset
+        self.invalidate_capabilities()
         self.__api.softwareReset()
         self.cache_axis_order()
 
@@ -336,53 +632,88 @@ class ThreespaceDevice:
     def get_raw_accel(self, id: int):
         return self.__api.getRawAccelVec(id).data    
     
-    def get_streamable_commands(self) -> list[StreamableCommands]: #TO DO - Make this work
-        commands = self.__api.readStreamableCommands()
-        registered_commands = []
-        for v in commands.split(','):
+    @property
+    def capabilities(self) -> ThreespaceCapabilities:
+        """
+        The cached capabilities of the sensor. Reloaded from the sensor
+        only if invalidated since the last time it was read.
+        """
+        if self.__capabilities is None:
+            self.cache_capabilities()
+        return self.__capabilities
+
+    def cache_capabilities(self):
+        capabilities = ThreespaceCapabilities()
+        capabilities.components = self.__api.readValidComponents().split(',')
+        for v in self.__api.readStreamableCommands().split(','):
             try:
-                registered_commands.append(StreamableCommands(int(v)))
+                capabilities.streamable_commands.append(StreamableCommands(int(v)))
             except:
                 Logger.log_warning(f"Sensor {self.name} has an unregistered streaming command {v}")
-        return registered_commands
+        capabilities.mags = self.__api.valid_mags.copy()
+        capabilities.accels = self.__api.valid_accels.copy()
+        capabilities.gyros = self.__api.valid_gyros.copy()
+        capabilities.baros = self.__api.valid_baros.copy()
+        self.__capabilities = capabilities
+
+    def invalidate_capabilities(self):
+        self.__capabilities = None
+
+    def get_streamable_commands(self) -> list[StreamableCommands]:
+        return self.capabilities.streamable_commands.copy()
     
     def get_available_mags(self):
-        return self.__api.valid_mags.copy()
+        return self.capabilities.mags.copy()
     
     def get_available_mags_str(self):
         components = self.get_available_components()
         return [v for v in components if "Mag" in v]    
     
     def get_available_accels(self):
-        return self.__api.valid_accels.copy()
+        return self.capabilities.accels.copy()
 
     def get_available_accels_str(self):
         components = self.get_available_components()
         return [v for v in components if "Accel" in v]
     
     def get_available_gyros(self):
-        return self.__api.valid_gyros.copy()
+        return self.capabilities.gyros.copy()
     
     def get_available_gyros_str(self):
         components = self.get_available_components()
         return [v for v in components if "Gyro" in v]
 
     def get_available_baros(self):
-        return self.__api.valid_baros.copy()
+        return self.capabilities.baros.copy()
     
     def get_available_baros_str(self):
         components = self.get_available_components()
         return [v for v in components if "Baro" in v]    
     
     def get_available_components(self):
-        components = self.__api.readValidComponents()
-        components = components.split(',')
-        return components
+        return self.capabilities.components.copy()
     
     def get_odrs(self, type: str, *ids):
         prefix = f"odr_{type}"
-        result = self.__api.read_settings(*[f"{prefix}{v}" for v in ids])
-        return {int(k.removeprefix(prefix)) : v for k, v in result.items()}
+        cached_odrs = self.capabilities.odrs
+        keys = [f"{prefix}{v}" for v in ids]
+        missing = [k for k in keys if k not in cached_odrs]
+        if len(missing) > 0:
+            cached_odrs.update(self.__api.read_settings(*missing))
+        return {int(k.removeprefix(prefix)) : cached_odrs[k] for k in keys}
+
+    def __invalidate_cached_odrs(self, keys):
+        if self.__capabilities is None: return
+        if any(key in self.ODR_RESET_KEYS for key in keys):
+            self.__capabilities.odrs.clear()
+            return
+        for key in keys:
+            self.__capabilities.odrs.pop(key, None)
+
+    def __on_transaction_write(self, sensor: ThreespaceSensor, keys: list[str]):
+        #The settings window and config wizard write through transactions on the API directly
+        if sensor is self.__api:
+            self.__invalidate_cached_odrs(keys)
 
     def get_accel_odrs(self, *ids):
         return self.get_odrs("accel", *ids)
@@ -393,7 +724,7 @@ class ThreespaceDevice:
     def set_odrs(self, type: str, odrs: dict[int, int]):
         prefix = f"odr_{type}"
         odrs = {f"{prefix}{k}" : v for k, v in odrs.items()}
-        self.__api.write_settings(**odrs)
+        self.set_settings(**odrs)
 
     def set_accel_odrs(self, odrs: dict[int, int]):
         self.set_odrs("accel", odrs)
@@ -460,7 +791,7 @@ class ThreespaceDevice:
         return calib[mat_key], calib[bias_key]
 
     def get_detected_components(self):
-        return self.__api.readValidComponents()
+        return ','.join(self.capabilities.components)
 
     def get_serial_number(self):
         if not self.is_open:
@@ -510,6 +841,7 @@ class ThreespaceDevice:
 
     def set_cached_settings_dirty(self):
         self.__api.set_cached_settings_dirty()
+        self.invalidate_capabilities()
 
     def send_ascii_command(self, ascii: str):
         if self.is_api_streaming():
@@ -656,10 +988,13 @@ class ThreespaceDevice:
         self.__api.beginPassiveAutoCalibration(threespace_consts.PASSIVE_CALIBRATE_GYRO)
 
     def upload_firmware(self, path: str):
+        self.invalidate_capabilities()
         uploader = ThreespaceFirmwareUploader(self.__api, path)
         uploader.upload_firmware()
     
     def get_firmware_uploader(self):
+        #The firmware is about to be replaced, so anything cached about it is no longer trustworthy
+        self.invalidate_capabilities()
         return ThreespaceFirmwareUploader(self.__api)
 
     def boot_firmware(self):
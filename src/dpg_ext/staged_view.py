@@ -99,4 +99,35 @@ class StagedTabManager(StagedView):
             for window in self.staged_view_dict.values():
                 window.delete()
         super().delete()
-        self.deleted = True
\ No newline at end of file
+        self.deleted = True
+from typing import Callable
+
+class LazyStagedView(StagedView):
+    """
+    Stands in for a view that is not constructed until the first time it is opened,
+    then forwards everything to it. The view is submitted to the container that was
+    on top of the container stack when this was created, such as a tab.
+    """
+
+    def __init__(self, factory: Callable[[], StagedView], parent: int = None):
+        self.factory = factory
+        self.parent = parent if parent is not None else dpg.top_container_stack()
+        self.view: StagedView = None
+
+    def submit(self, parent = None):
+        #Nothing to submit until the view is built
+        return self
+
+    def notify_opened(self, old_view: StagedView):
+        if self.view is None:
+            self.view = self.factory()
+            self.view.submit(self.parent)
+        self.view.notify_opened(old_view)
+
+    def notify_closed(self, new_view: StagedView):
+        if self.view is None: return
+        self.view.notify_closed(new_view)
+
+    def delete(self):
+        if self.view is None: return
+        self.view.delete()
@@ -0,0 +1,264 @@
+"""
+Storage for live chart data. Points are kept in preallocated float64 arrays
+so adding a point is O(1) and the charted data can be handed to dearpygui
+as contiguous views without converting python lists.
+"""
+import numpy as np
+
+class ChartRingBuffer:
+    """
+    Holds the most recent capacity points for a shared X axis and any number of Y channels.
+    The backing arrays are twice the capacity. Points are appended linearly and once the end
+    is reached the most recent points are moved back to the front, so the valid data is always
+    one contiguous slice and the move is amortized to O(1) per point.
+
+    The min/max across all channels is maintained as points are added. It is only recomputed
+    over the whole window when a point holding the current min or max leaves the window.
+    """
+
+    def __init__(self, capacity: int, num_channels: int):
+        self.capacity = max(1, int(capacity))
+        self.num_channels = num_channels
+        self.__write_count = 0
+        self.__allocate()
+
+    def __allocate(self):
+        self.__x = np.zeros(self.capacity * 2, dtype=np.float64)
+        self.__y = np.zeros((self.num_channels, self.capacity * 2), dtype=np.float64) #Channel major so each channel is contiguous
+        self.__start = 0
+        self.__end = 0
+        self.__reset_bounds()
+
+    def __reset_bounds(self):
+        self.__min = np.inf
+        self.__max = -np.inf
+        self.__bounds_dirty = False
+
+    def __len__(self):
+        return self.__end - self.__start
+
+    @property
+    def is_full(self):
+        return len(self) >= self.capacity
+
+    @property
+    def x(self) -> np.ndarray:
+        """View of the X values, oldest first. Only valid until the buffer is next modified"""
+        return self.__x[self.__start:self.__end]
+
+    @property
+    def y(self) -> np.ndarray:
+        """View of the Y values with a row per channel. Only valid until the buffer is next modified"""
+        return self.__y[:,self.__start:self.__end]
+
+    def channel(self, index: int) -> np.ndarray:
+        return self.__y[index,self.__start:self.__end]
+
+    @property
+    def write_count(self) -> int:
+        """Total points ever added, which is also the sample index the next point will have"""
+        return self.__write_count
+
+    def get_range(self, start: int, end: int) -> tuple[np.ndarray,np.ndarray]:
+        """
+        Views of the X and Y values for the sample indices [start, end), see write_count.
+        Only the part of the range still held by the buffer is returned.
+        """
+        first = self.__write_count - len(self)
+        start = min(max(start, first), self.__write_count) - first + self.__start
+        end = max(min(end, self.__write_count) - first + self.__start, start)
+        return self.__x[start:end], self.__y[:,start:end]
+
+    @property
+    def last_x(self):
+        if len(self) == 0: return None
+        return self.__x[self.__end-1]
+
+    @property
+    def bounds(self) -> tuple[float,float]:
+        """The (min, max) of all channels in the window, or None if there is no data"""
+        if len(self) == 0 or self.num_channels == 0: return None
+        if self.__bounds_dirty:
+            y = self.y
+            self.__min = np.min(y)
+            self.__max = np.max(y)
+            self.__bounds_dirty = False
+        return self.__min, self.__max
+
+    def append(self, x: float, values: list[float]):
+        if self.__end == len(self.__x):
+            self.__compact(1)
+        self.__x[self.__end] = x
+        self.__y[:,self.__end] = values
+        self.__end += 1
+        self.__write_count += 1
+        if len(self) > self.capacity:
+            self.__evict(self.__start + 1)
+        if not self.__bounds_dirty and self.num_channels > 0:
+            column = self.__y[:,self.__end-1]
+            self.__min = min(self.__min, column.min())
+            self.__max = max(self.__max, column.max())
+
+    def extend(self, x: np.ndarray, data: np.ndarray):
+        """
+        Add many points. Data should have a row per X value and a column per channel.
+        """
+        count = len(x)
+        if count == 0: return
+        self.__write_count += count
+        if count >= self.capacity: #Only the newest points could possibly be kept
+            x = x[-self.capacity:]
+            data = data[-self.capacity:]
+            self.__start = self.__end = 0
+            self.__reset_bounds()
+            count = self.capacity
+        elif self.__end + count > len(self.__x):
+            self.__compact(count)
+
+        self.__x[self.__end:self.__end+count] = x
+        self.__y[:,self.__end:self.__end+count] = data.T
+        self.__end += count
+        self.__evict(max(self.__start, self.__end - self.capacity))
+        if not self.__bounds_dirty and self.num_channels > 0:
+            added = self.__y[:,self.__end-count:self.__end]
+            self.__min = min(self.__min, added.min())
+            self.__max = max(self.__max, added.max())
+
+    def __evict(self, new_start: int):
+        #Only need to recompute the bounds if one of the extremes is leaving the window
+        if new_start > self.__start and not self.__bounds_dirty and self.num_channels > 0:
+            evicted = self.__y[:,self.__start:new_start]
+            if evicted.min() <= self.__min or evicted.max() >= self.__max:
+                self.__bounds_dirty = True
+        self.__start = new_start
+
+    def __compact(self, incoming: int):
+        #Move the points that will still be kept after adding the incoming points to the front
+        keep = min(len(self), self.capacity - incoming)
+        src = self.__end - keep
+        self.__evict(src)
+        self.__x[:keep] = self.__x[src:self.__end]
+        self.__y[:,:keep] = self.__y[:,src:self.__end]
+        self.__start = 0
+        self.__end = keep
+
+    def set_capacity(self, capacity: int):
+        capacity = max(1, int(capacity))
+        if capacity == self.capacity: return
+        x, y = self.x.copy(), self.y.copy()
+        write_count = self.__write_count
+        self.capacity = capacity
+        self.__allocate()
+        self.extend(x, y.T)
+        self.__write_count = write_count
+
+    def clear(self):
+        self.__start = 0
+        self.__end = 0
+        self.__reset_bounds()
+
+from multiprocessing import shared_memory
+import sys
+
+class SharedChartRingBuffer:
+    """
+    A ring of float64 rows in shared memory, used to hand chart data to another process without
+    pickling every sample. One process creates and writes to it, the other attaches by name and reads
+    every row written since it last read. Only the rows are shared, anything else should go over a pipe.
+    """
+
+    #Header layout, stored as int64 before the rows
+    WRITE_COUNT = 0 #Total rows ever written
+    GENERATION = 1 #Incremented when the writer restarts, rows from before then should not be read
+    GENERATION_START = 2 #The write count when the current generation started
+    CAPACITY = 3
+    NUM_COLUMNS = 4
+    HEADER_SIZE = 5
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((self.HEADER_SIZE,), dtype=np.int64, buffer=shm.buf)
+        self.capacity = int(self.header[self.CAPACITY])
+        self.num_columns = int(self.header[self.NUM_COLUMNS])
+        self.rows = np.ndarray((self.capacity, self.num_columns), dtype=np.float64, buffer=shm.buf, offset=self.HEADER_SIZE * 8)
+
+        self.read_count = int(self.header[self.WRITE_COUNT])
+        self.read_generation = int(self.header[self.GENERATION])
+
+    @staticmethod
+    def create(capacity: int, num_columns: int):
+        size = (SharedChartRingBuffer.HEADER_SIZE + capacity * num_columns) * 8
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((SharedChartRingBuffer.HEADER_SIZE,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[SharedChartRingBuffer.CAPACITY] = capacity
+        header[SharedChartRingBuffer.NUM_COLUMNS] = num_columns
+        del header #Can't close the shared memory while views of it exist
+        return SharedChartRingBuffer(shm, True)
+
+    @staticmethod
+    def attach(name: str):
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            #Prior to 3.13 attaching registers the memory with this process's resource tracker, which would
+            #unlink it when this process exits even though the creator owns it
+            if sys.platform != "win32":
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+        return SharedChartRingBuffer(shm, False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def restart(self):
+        """Called by the writer to make the reader discard anything it has not read yet"""
+        self.header[self.GENERATION_START] = self.header[self.WRITE_COUNT]
+        self.header[self.GENERATION] += 1
+
+    def write(self, rows: np.ndarray):
+        count = len(rows)
+        if count == 0: return
+        write_count = int(self.header[self.WRITE_COUNT])
+        if count > self.capacity:
+            rows = rows[-self.capacity:]
+        start = (write_count + count - len(rows)) % self.capacity
+        first = min(len(rows), self.capacity - start)
+        self.rows[start:start+first] = rows[:first]
+        self.rows[:len(rows)-first] = rows[first:]
+        #Only publish the rows after they are written
+        self.header[self.WRITE_COUNT] = write_count + count
+
+    def read(self) -> np.ndarray:
+        """
+        Copy of every row written since the last read, oldest first.
+        Rows that were overwritten before they could be read are skipped.
+        """
+        generation = int(self.header[self.GENERATION])
+        if generation != self.read_generation:
+            self.read_generation = generation
+            self.read_count = max(self.read_count, int(self.header[self.GENERATION_START]))
+        write_count = int(self.header[self.WRITE_COUNT])
+        start = max(self.read_count, write_count - self.capacity)
+        self.read_count = write_count
+        if write_count <= start:
+            return self.rows[:0].copy()
+        
+        indices = np.arange(start, write_count) % self.capacity
+        rows = self.rows[indices]
+
+        #The writer may have wrapped around onto the rows while they were being copied
+        overwritten = int(self.header[self.WRITE_COUNT]) - self.capacity - start
+        if overwritten > 0:
+            rows = rows[overwritten:]
+        return rows
+
+    def close(self):
+        self.header = None
+        self.rows = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,108 @@
+"""
+Reduces the number of points sent to dearpygui when a series has more
+points than the plot has pixels to show them. Each method takes the
+X and Y of a single series and returns the decimated X and Y.
+"""
+import numpy as np
+
+def decimate_minmax(x: np.ndarray, y: np.ndarray, num_buckets: int, offset: int = 0):
+    """
+    Splits the series into num_buckets and keeps the min and max of each, in order.
+    Keeps every spike, so this is the best match for what would have been drawn at one bucket per pixel.
+    offset - The sample index of the first point. Buckets start at multiples of the bucket size from sample 0,
+    so the same points stay in the same bucket as a live chart's window slides instead of the trace shimmering.
+    """
+    n = len(y)
+    bucket_size = int(np.ceil(n / max(1, num_buckets)))
+    if bucket_size <= 2: return x, y
+    x = np.asarray(x, dtype=np.float64)
+
+    start = (-offset) % bucket_size #Points before the first bucket boundary
+    num_full = (n - start) // bucket_size
+    end = start + num_full * bucket_size
+    buckets = y[start:end].reshape(num_full, bucket_size)
+    mins = np.argmin(buckets, axis=1)
+    maxs = np.argmax(buckets, axis=1)
+    offsets = start + np.arange(num_full) * bucket_size
+    indices = np.empty(num_full * 2 + 5, dtype=np.intp)
+    count = 0
+
+    #The partial bucket at the start
+    if start > 0:
+        head = y[:start]
+        indices[0:2] = sorted((np.argmin(head), np.argmax(head)))
+        count = 2
+
+    indices[count:count+num_full*2:2] = np.minimum(mins, maxs) + offsets
+    indices[count+1:count+num_full*2:2] = np.maximum(mins, maxs) + offsets
+    count += num_full * 2
+
+    #The partial bucket at the end. Always include the last point so the head of a live chart is exact.
+    if end < n:
+        tail = y[end:]
+        first, second = sorted((end + np.argmin(tail), end + np.argmax(tail)))
+        indices[count] = first
+        indices[count+1] = second
+        count += 2
+    if indices[count-1] != n - 1:
+        indices[count] = n - 1
+        count += 1
+    indices = indices[:count]
+    return x[indices], y[indices]
+
+def decimate_lttb(x: np.ndarray, y: np.ndarray, num_points: int):
+    """
+    Largest-Triangle-Three-Buckets, keeps the point from each bucket that forms the largest triangle with
+    its neighboring buckets, which preserves the visual shape well with one point per bucket.
+    Standard LTTB uses the point selected from the previous bucket, which requires processing the buckets
+    one at a time. This uses the previous bucket's average instead so all buckets are done at once.
+    """
+    n = len(y)
+    if num_points >= n or num_points < 3: return x, y
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    #The first and last points are always kept, everything in between is split into buckets
+    num_buckets = num_points - 2
+    edges = np.linspace(1, n - 1, num_buckets + 1).astype(np.intp)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n-1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n-1], edges[:-1]) / counts
+
+    #Point A is the previous bucket, C is the next bucket
+    a_x = np.concatenate(([x[0]], avg_x[:-1]))
+    a_y = np.concatenate(([y[0]], avg_y[:-1]))
+    c_x = np.concatenate((avg_x[1:], [x[-1]]))
+    c_y = np.concatenate((avg_y[1:], [y[-1]]))
+
+    #Area of the triangle formed by each point in a bucket with that buckets A and C. The 1/2 is not needed for comparison
+    bucket_x = x[1:n-1]
+    bucket_y = y[1:n-1]
+    a_x, a_y, c_x, c_y = (np.repeat(v, counts) for v in (a_x, a_y, c_x, c_y))
+    areas = np.abs((a_x - c_x) * (bucket_y - a_y) - (a_x - bucket_x) * (c_y - a_y))
+
+    #First index in each bucket with the largest area
+    is_max = areas == np.repeat(np.maximum.reduceat(areas, edges[:-1] - 1), counts)
+    bucket_ids = np.repeat(np.arange(num_buckets), counts)
+    candidates = np.flatnonzero(is_max)
+    _, first = np.unique(bucket_ids[candidates], return_index=True)
+    indices = np.concatenate(([0], candidates[first] + 1, [n - 1]))
+    return x[indices], y[indices]
+
+DECIMATION_NONE = "None"
+DECIMATION_MINMAX = "Min/Max"
+DECIMATION_LTTB = "LTTB"
+
+def decimate(method: str, x: np.ndarray, y: np.ndarray, num_pixels: int, offset: int = 0):
+    """
+    Decimate the series to fit in num_pixels using the given method.
+    Series with less than two points per pixel are returned as is.
+    offset - The sample index of the first point, see decimate_minmax
+    """
+    if method == DECIMATION_NONE or len(y) <= num_pixels * 2:
+        return x, y
+    if method == DECIMATION_MINMAX:
+        return decimate_minmax(x, y, num_pixels, offset=offset)
+    if method == DECIMATION_LTTB:
+        return decimate_lttb(x, y, num_pixels * 2)
+    raise ValueError(f"Unknown decimation method {method}")
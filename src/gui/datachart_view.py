@@ -5,6 +5,9 @@ import third_party.dearpygui_grid as dpg_grid
 from dpg_ext.dynamic_button import DynamicButton
 
 from gui.resources import theme_lib
+from gui.chart_buffer import ChartRingBuffer, SharedChartRingBuffer
+import gui.chart_decimation as chart_decimation
+from utility import FrameUpdateScheduler, FrameProfiler, Logger
 
 import data_charts
 from data_charts import StreamOption, StreamableCommands
@@ -15,6 +18,7 @@ import numpy as np
 class SensorDataWindow:
 
     THEMES = None
+    DEFAULT_PIXEL_WIDTH = 1000
 
     def __init__(self, options: list[StreamOption] = None, default_option: tuple[StreamOption,int]=None, options_selectable: bool = True, default_value: str=None, max_points=500, on_option_modified: Callable[["SensorDataWindow"],None] = None):
         if SensorDataWindow.THEMES is None:
@@ -32,14 +36,22 @@ class SensorDataWindow:
         self.vertical_line_pos: float = None
         self.pad_percent = 0.05
         self.bounds_y = data_charts.get_min_bounds_for_option(self.cur_option)
+        self.decimation = chart_decimation.DECIMATION_MINMAX #How to reduce series that have more points than the plot has pixels
+        self.__tick_window: tuple[int,int] = None #The whole second (min, max) the manual ticks were last set for, None when DPG is handling the ticks
+        self.__ticks: tuple[tuple[str,int]] = ()
 
         #Chart GUI Elements
         self.text = []
         self.series = []
 
         #Chart Data Storage
-        self.y_data: list[list] = [] #One set per series
-        self.x_data: list[int] = [] #Shared x axis across all series
+        self.buffer = ChartRingBuffer(max_points, 0)
+        self.external_axes: tuple[np.ndarray,np.ndarray] = None #Set when the data is supplied all at once via set_axes
+
+        #What was last sent to the series, before decimation. Used for looking up values on the graph.
+        #Data from the buffer is kept as the range of sample indices that was sent instead of being copied every update
+        self.__rendered_axes: tuple[np.ndarray,np.ndarray] = (np.zeros(0, dtype=np.float64), np.zeros((0, 0), dtype=np.float64))
+        self.__rendered_range: tuple[int,int] = None
 
         with dpg.child_window() as self.window:
             #Option Selection
@@ -78,39 +90,109 @@ class SensorDataWindow:
         option is selected in the window. Must call update for added points to
         actually display.
         """
-        if len(self.x_data) > 0 and x < self.x_data[-1]: #New point is in the past, clear the chart before graphing
+        if self.external_axes is not None or (len(self.buffer) > 0 and x < self.buffer.last_x): #New point is in the past, clear the chart before graphing
             self.clear_chart(False)
-        self.x_data.append(x)
         if not isinstance(data, list): #Force data to always be a list for consistency
             data = [data]
-        for i, v in enumerate(data):
-            self.y_data[i].append(v)
+        self.buffer.append(x, data)
+
+    def add_points(self, x: np.ndarray, data: np.ndarray):
+        """
+        Same as add_point, but for many points at once. Data should have a row per x value.
+        """
+        if len(x) == 0: return
+        if data.ndim == 1:
+            data = np.expand_dims(data, 1)
         
-        while len(self.x_data) > self.max_points:
-            self.x_data.pop(0)
-            for axis in self.y_data:
-                axis.pop(0)
+        #Only keep the points after the last time the X axis went backwards, same as clearing in add_point
+        restarts = np.flatnonzero(np.diff(x) < 0)
+        if len(restarts) > 0:
+            x = x[restarts[-1]+1:]
+            data = data[restarts[-1]+1:]
+            self.clear_chart(False)
+        elif self.external_axes is not None or (len(self.buffer) > 0 and x[0] < self.buffer.last_x):
+            self.clear_chart(False)
+
+        self.buffer.extend(x, data)
 
-    def set_axes(self, x_axis: list, y_axis: list):
-        self.x_data = x_axis
-        self.y_data = y_axis
+    def set_axes(self, x_axis: np.ndarray, y_axis: np.ndarray):
+        """
+        Replace the charted data with the given axes instead of the internal buffer.
+        y_axis should have a contiguous row per series.
+        """
+        self.external_axes = (x_axis, y_axis)
+
+    @property
+    def x_data(self) -> np.ndarray:
+        if self.external_axes is not None:
+            return self.external_axes[0]
+        return self.buffer.x
+
+    @property
+    def y_data(self) -> np.ndarray:
+        if self.external_axes is not None:
+            return self.external_axes[1]
+        return self.buffer.y
 
     def set_max_points(self, max_points: int):
         self.max_points = max_points
+        self.buffer.set_capacity(max_points)
+
+    def set_decimation(self, method: str):
+        self.decimation = method
 
+    @FrameProfiler.timed("Chart Update")
     def update(self, fix_ticks=True):
         """
         Must be called for visual updates to actually occur.
         """
         #Update Series and Display Numbers
+        x_data = self.x_data
+        y_data = self.y_data
+        if self.external_axes is None:
+            self.__rendered_range = (self.buffer.write_count - len(self.buffer), self.buffer.write_count)
+            sample_offset = self.__rendered_range[0]
+        else:
+            self.__set_rendered_axes(np.asarray(x_data, dtype=np.float64), y_data)
+            sample_offset = 0
+        num_pixels = dpg.get_item_rect_size(self.plot)[0] or self.DEFAULT_PIXEL_WIDTH #Not known until the plot has been rendered
         for i, series in enumerate(self.series):
-            dpg.configure_item(series, x=self.x_data, y=self.y_data[i]) #Set the axis info
-            if i < len(self.text) and len(self.y_data[i]) > 0: #Set the text above up to the last number
-                dpg.set_value(self.text[i], f"{self.y_data[i][-1]: .05f}")
+            series_x, series_y = chart_decimation.decimate(self.decimation, x_data, y_data[i], num_pixels, offset=sample_offset)
+            dpg.configure_item(series, x=series_x, y=series_y) #Set the axis info
+            if i < len(self.text) and len(y_data[i]) > 0: #Set the text above up to the last number
+                dpg.set_value(self.text[i], f"{y_data[i][-1]: .05f}")
         
         self.__update_bounds()
         self.__fix_ticks(no_fix=not fix_ticks)
 
+    def __set_rendered_axes(self, x: np.ndarray, y: np.ndarray):
+        self.__rendered_axes = (x, y)
+        self.__rendered_range = None
+
+    def get_rendered_axes(self) -> tuple[np.ndarray,np.ndarray]:
+        """
+        The X and Y last sent to the series. Points from the buffer are only
+        available while the buffer still holds them, see snapshot_rendered.
+        """
+        if self.__rendered_range is not None:
+            return self.buffer.get_range(*self.__rendered_range)
+        return self.__rendered_axes
+
+    def snapshot_rendered(self):
+        """
+        Copy what was last rendered out of the buffer. Should be called when updates stop but points
+        keep being added, such as when paused, so values can still be looked up once those points leave the buffer.
+        """
+        if self.__rendered_range is None: return
+        x, y = self.get_rendered_axes()
+        self.__set_rendered_axes(x.copy(), y.copy())
+
+    def queue_update(self, fix_ticks=True):
+        """
+        Same as update, but done at most once before the next frame is rendered
+        """
+        FrameUpdateScheduler.request(self, self.update, fix_ticks)
+
     def set_vline_pos(self, x: float):
         if self.vertical_line_pos == x: return
         if x is None: #Remove the line
@@ -128,40 +210,32 @@ class SensorDataWindow:
     def set_text_values_at_x(self, x):
         """
         Sets the text values to the values at the given x value on the graph.
-        This uses the values from the series itself because its based on what is graphically shown
+        This uses the values last sent to the series because its based on what is graphically shown
         rather then what is in the buffer. The user is allowed to continue adding points without rendering
         them, but the intention of this is to show the value at a point on the graph, not an arbitrary point
         in the buffer.
         """
-        if len(self.series) == 0: return
-        min_index = None
-        max_index = None
-        x_data = dpg.get_value(self.series[0])[0] #Gotta used the cache X data because if paused, the x data still updates but want to do based on what is graphed
+        x_data, y_data = self.get_rendered_axes()
+        if len(x_data) < 2: return
 
         #Find the index of the two points this x value is between
-        for i in range(len(x_data)-1):
-            if x_data[i] <= x <= x_data[i+1]:
-                min_index = i
-                max_index = i + 1
-                break
-        
-        #This X value was not found
-        if min_index is None:
+        max_index = np.searchsorted(x_data, x, side="right")
+        if max_index == len(x_data) and x == x_data[-1]:
+            max_index -= 1
+        if max_index == 0 or max_index == len(x_data): #This X value was not found
             return
+        min_index = max_index - 1
         
-        #Linearly interpolate between the data points based on the supplied X
+        #Linearly interpolate between the data points based on the supplied X for all the axes at once
         min_x = x_data[min_index]
         max_x = x_data[max_index]
-        percent = (x - min_x) / (max_x - min_x)
-
-        #Get the Y value from all the axes up to the number of available text spots, and set them
-        num_axes = min(len(self.text), len(self.y_data))
-        for i in range(num_axes):
-            y_data = dpg.get_value(self.series[i])[1]
-            min_y = y_data[min_index]
-            max_y = y_data[max_index]
-            y = min_y + percent * (max_y - min_y)
-            dpg.set_value(self.text[i], f"{y: .05f}")
+        percent = 0 if max_x == min_x else (x - min_x) / (max_x - min_x)
+        num_axes = min(len(self.text), len(y_data))
+        min_y = y_data[:num_axes,min_index]
+        max_y = y_data[:num_axes,max_index]
+        values = min_y + percent * (max_y - min_y)
+        for text, y in zip(self.text, values):
+            dpg.set_value(text, f"{y: .05f}")
 
     def set_text_values_to_head(self):
         """
@@ -169,10 +243,9 @@ class SensorDataWindow:
         Sets the text values to the most recent point that is currently rendered,
         not the most recent point added to the data buffer.
         """
-        if len(self.series) == 0: return
-        x_data = dpg.get_value(self.series[0])[0]
+        x_data = self.get_rendered_axes()[0]
         if len(x_data) == 0: return
-        self.set_text_values_at_x(x_data[-1])      
+        self.set_text_values_at_x(x_data[-1])
 
     def set_options(self, options: list[StreamOption], default_option: tuple[StreamOption,int] = None, default_value: str = None, update_window: bool = True):
         #Remove invalid options (Options that output strings)
@@ -255,29 +328,25 @@ class SensorDataWindow:
         #Add the line series
         dpg.delete_item(self.y_axis, children_only=True)
         self.series.clear()
-        self.x_data = [] #Doing this instead of clear to allow working with numpy arrays when set_axes is used
-        self.y_data = []
+        self.buffer = ChartRingBuffer(self.max_points, num_out)
+        self.external_axes = None
+        self.__set_rendered_axes(np.zeros(0, dtype=np.float64), np.zeros((num_out, 0), dtype=np.float64))
         dpg.push_container_stack(self.y_axis)
         self.vertical_line = dpg.add_inf_line_series(x=[])
         dpg.bind_item_theme(self.vertical_line, theme_lib.plot_indicator_theme)
         for i in range(num_out):
-            self.y_data.append([])
-            self.series.append(dpg.add_line_series(self.x_data, self.y_data[i], label=f"{i}"))
+            self.series.append(dpg.add_line_series([], [], label=f"{i}"))
             if i < len(SensorDataWindow.THEMES):
                 dpg.bind_item_theme(self.series[-1], SensorDataWindow.THEMES[i])
         dpg.pop_container_stack()
 
     def __update_bounds(self):
-        if isinstance(self.y_data, np.ndarray):
-            max_y = np.max(self.y_data)
-            min_y = np.min(self.y_data)
+        if self.external_axes is not None:
+            y_data = self.external_axes[1]
+            bounds = None if y_data.size == 0 else (np.min(y_data), np.max(y_data))
         else:
-            if len(self.y_data[0]) == 0:
-                max_y = 0
-                min_y = 0
-            else:
-                max_y = max(max(data) for data in self.y_data)
-                min_y = min(min(data) for data in self.y_data)
+            bounds = self.buffer.bounds #Tracked as points are added
+        min_y, max_y = (0, 0) if bounds is None else bounds
         
         #Clamp the max and min range
         if self.bounds_y[1] is not None:
@@ -293,21 +362,33 @@ class SensorDataWindow:
         dpg.set_axis_limits(self.y_axis, min_y, max_y)  
 
         #Remove the vertical line if it went out of bounds
-        min_x = self.x_data[0] if len(self.x_data) > 0 else 0
+        x_data = self.x_data
+        min_x = x_data[0] if len(x_data) > 0 else 0
         if self.vertical_line_pos is not None and min_x > self.vertical_line_pos:
             self.set_vline_pos(None)  
 
     def __fix_ticks(self, no_fix=False):
-        if len(self.x_data) != self.max_points or no_fix:
-            dpg.reset_axis_ticks(self.x_axis) #Allow ticks to be automatically handled when not at max points
+        if not self.buffer.is_full or self.external_axes is not None or no_fix:
+            if self.__tick_window is not None:
+                dpg.reset_axis_ticks(self.x_axis) #Allow ticks to be automatically handled when not at max points
+                self.__tick_window = None
+                self.__ticks = ()
             return
         #Once at max points, sometimes DPG will flash between using whole and half second intervals. To avoid this, control the ticks manually.
         #This makes the ticks only show in full seconds
-        min_x_tick = int(self.x_data[0]) #Exclusive
-        max_x_tick = int(self.x_data[-1]) #Inclusive
-        axis_ticks = list(range(min_x_tick + 1, max_x_tick + 1))
-        axis_ticks = tuple([(str(v), v) for v in axis_ticks])
-        dpg.set_axis_ticks(self.x_axis, axis_ticks)
+        min_x_tick = int(self.buffer.x[0]) #Exclusive
+        max_x_tick = int(self.buffer.last_x) #Inclusive
+        if self.__tick_window == (min_x_tick, max_x_tick): return #Ticks only change when the window crosses a whole second
+
+        #Slide the existing ticks instead of rebuilding them when the windows overlap
+        if self.__tick_window is not None and self.__tick_window[0] <= min_x_tick <= self.__tick_window[1] <= max_x_tick:
+            old_min, old_max = self.__tick_window
+            new_ticks = tuple((str(v), v) for v in range(old_max + 1, max_x_tick + 1))
+            self.__ticks = self.__ticks[min_x_tick - old_min:] + new_ticks
+        else:
+            self.__ticks = tuple((str(v), v) for v in range(min_x_tick + 1, max_x_tick + 1))
+        self.__tick_window = (min_x_tick, max_x_tick)
+        dpg.set_axis_ticks(self.x_axis, self.__ticks)
     
     #--------------------------Events-------------------------------------
     def _on_stream_param_changed(self, sender, app_data):
@@ -330,11 +411,12 @@ class SensorDataWindow:
             self.option_modfied_callback(self)
 
     def clear_chart(self, immediate=True):
-        self.x_data = []
-        for i, series in enumerate(self.series):
-            self.y_data[i] = []
-            if immediate:
-                dpg.configure_item(series, x=self.x_data, y=self.y_data[i])
+        self.buffer.clear()
+        self.external_axes = None
+        if immediate:
+            self.__set_rendered_axes(np.zeros(0, dtype=np.float64), np.zeros((len(self.series), 0), dtype=np.float64))
+            for series in self.series:
+                dpg.configure_item(series, x=[], y=[])
 
     def notify_open(self):
         self.opened = True
@@ -343,6 +425,7 @@ class SensorDataWindow:
         self.opened = False
 
     def destroy(self):
+        FrameUpdateScheduler.cancel(self)
         self.dropdown.delete()
         dpg.delete_item(self.window)
 
@@ -402,6 +485,14 @@ class DataChartsWindow:
                     continue
                 window.add_point(x, y)
 
+    def add_data_batch(self, option: tuple[StreamableCommands,int], x: np.ndarray, y: np.ndarray):
+        for col in self.data_windows:
+            for window in col:
+                wo = window.get_option()
+                if wo[0].cmd != option[0] or wo[1] != option[1]: 
+                    continue
+                window.add_points(x, y)
+
     def update_display(self, fix_ticks=True):
         for col in self.data_windows:
             for window in col:
@@ -457,6 +548,9 @@ class DataChartPopoutWindowProcess(DataChartsWindow):
         self.paused = paused
         self.set_vline_enabled(paused)
         if paused:
+            for col in self.data_windows:
+                for window in col:
+                    window.snapshot_rendered() #Points keep being added while paused
             self.pause_button.set_button("resume")
         else:
             self.pause_button.set_button("pause")
@@ -467,48 +561,214 @@ class DataChartPopoutWindowProcess(DataChartsWindow):
 
 import multiprocessing
 import multiprocessing.connection
+import time
 """
-The actual multiprocessing target for creating a data chart window controlled by multiprocessing.
+The actual multiprocessing target for the process that hosts every data chart popout.
+Each popout is its own window inside the hosts viewport. The process is started ahead of
+time and waits to create its viewport until the first popout is opened, so opening popouts
+does not have to wait on a new process importing and initializing everything.
 """
-def dataChartPopoutWindow(name: str, default_selections: list[list[tuple[StreamOption,int]]], conn: multiprocessing.connection.Connection):
+def chartPopoutHostProcess(conn: multiprocessing.connection.Connection):
     import gui.resources.theme_lib as theme_lib
     from gui.core_ui import FontManager
     from managers.resource_manager import IMAGE_FOLDER
     from dpg_ext.dynamic_button import DynamicButton
 
     dpg.create_context()
-    dpg.create_viewport(title=name, large_icon=(IMAGE_FOLDER / "icon.ico").as_posix())
 
     theme_lib.init()
     FontManager.init()
     dpg.bind_font(FontManager.DEFAULT_FONT)
 
-    with dpg.window() as primary_window:
-        charts = DataChartPopoutWindowProcess(default_selections)
-
-    dpg.set_primary_window(primary_window, True)
+    #Popout ID -> (window, charts, shared buffer, shared layout)
+    popouts: dict[int,tuple[int,DataChartPopoutWindowProcess,SharedChartRingBuffer,list]] = {}
+    closed_popouts: list[int] = []
+    viewport_created = False
+
+    def on_window_closed(sender, app_data, user_data):
+        closed_popouts.append(user_data)
+
+    def close_popout(popout_id: int):
+        if popout_id not in popouts: return
+        window, charts, shared_buffer, _ = popouts.pop(popout_id)
+        dpg.delete_item(window)
+        shared_buffer.close()
+
+    def open_popout(popout_id: int, name: str, selections: list[list[tuple[StreamOption,int]]], shared_name: str, shared_layout: list):
+        offset = 30 * (len(popouts) % 10) #Cascade the windows so they aren't on top of each other
+        with dpg.window(label=name, width=800, height=600, pos=(offset, offset), on_close=on_window_closed, user_data=popout_id) as window:
+            charts = DataChartPopoutWindowProcess(selections)
+        popouts[popout_id] = (window, charts, SharedChartRingBuffer.attach(shared_name), shared_layout)
+
+    #Wait for the first popout before showing anything
+    while not viewport_created:
+        command = conn.recv()
+        if command[0] == "open":
+            dpg.create_viewport(title="Data Charts", large_icon=(IMAGE_FOLDER / "icon.ico").as_posix())
+            dpg.setup_dearpygui()
+            dpg.show_viewport()
+            viewport_created = True
+            open_popout(*command[1:])
+        elif command[0] == "exit":
+            dpg.destroy_context()
+            conn.close()
+            return
 
-    dpg.setup_dearpygui()
-    dpg.show_viewport()
     while dpg.is_dearpygui_running():
+        updates: dict[int,bool] = {} #Multiple updates can arrive per frame, only need to do the last one
         while conn.poll(0):
             command = conn.recv()
-            if command[0] == "point":
-                charts.add_data(*command[1:])
-            elif command[0] == "update":
-                charts.update_display(fix_ticks=command[1])
+            if command[0] == "open":
+                open_popout(*command[1:])
+                continue
+            elif command[0] == "close":
+                close_popout(command[1])
+                continue
+            popout_id = command[1]
+            if popout_id not in popouts: continue #Messages may arrive for a popout after it was closed
+            charts = popouts[popout_id][1]
+            if command[0] == "update":
+                updates[popout_id] = command[2]
             elif command[0] == "clear":
                 charts.clear()
             elif command[0] == "max":
-                charts.set_max_points(command[1])
+                charts.set_max_points(command[2])
+        
+        #Streamed rows come through shared memory, the pipe is only used for control
+        for _, charts, shared_buffer, shared_layout in popouts.values():
+            rows = shared_buffer.read()
+            if len(rows) == 0: continue
+            x = rows[:,0]
+            for option, column, num_out in shared_layout:
+                if np.isnan(rows[0,column]): continue #Option is not currently streaming
+                charts.add_data_batch(option, x, rows[:,column:column+num_out])
+
+        for popout_id, fix_ticks in updates.items():
+            popouts[popout_id][1].update_display(fix_ticks=fix_ticks)
+
+        #Window close callbacks happen during the frame, so cleanup after
         dpg.render_dearpygui_frame()
+        while len(closed_popouts) > 0:
+            popout_id = closed_popouts.pop()
+            close_popout(popout_id)
+            try:
+                conn.send(("closed", popout_id))
+            except OSError: pass
+
+    for popout_id in list(popouts.keys()):
+        close_popout(popout_id)
     dpg.destroy_context()
-
     conn.close()
 
+class ChartPopoutHost:
+    """
+    Main process side of the chart popout host process. There is only one host, shared
+    by all the popouts. Call update from the main loop to receive events from the host.
+    Once the host exits, it is only started again when a popout is opened. A host that exits shortly
+    after starting counts as a failed start, which delays the next start and eventually stops retrying.
+    """
+
+    STARTUP_TIME = 5 #Seconds the host must run for to not count as a failed start
+    RETRY_DELAY = 1 #Seconds before starting again after the first failed start, doubled for each failure after
+    MAX_FAILED_STARTS = 5
+
+    process: multiprocessing.Process = None
+    conn: multiprocessing.connection.Connection = None
+    next_id = 0
+    on_closed: dict[int,Callable[[],None]] = {}
+    shutdown = False
+
+    start_time = 0
+    failed_starts = 0
+    retry_time = 0
+
+    @staticmethod
+    def start():
+        """Start the host process in the background if not already running"""
+        if ChartPopoutHost.is_running() or ChartPopoutHost.shutdown: return
+        if ChartPopoutHost.failed_starts >= ChartPopoutHost.MAX_FAILED_STARTS or time.monotonic() < ChartPopoutHost.retry_time: return
+        parent_conn, child_conn = multiprocessing.Pipe()
+        ChartPopoutHost.conn = parent_conn
+        ChartPopoutHost.process = multiprocessing.Process(target=chartPopoutHostProcess, args=(child_conn,), daemon=True)
+        ChartPopoutHost.process.start()
+        ChartPopoutHost.start_time = time.monotonic()
+
+    @staticmethod
+    def is_running():
+        return ChartPopoutHost.process is not None and ChartPopoutHost.process.is_alive()
+
+    @staticmethod
+    def open_popout(name: str, selections: list[list[tuple[StreamOption,int]]], shared_name: str, shared_layout: list, on_closed: Callable[[],None]):
+        ChartPopoutHost.start()
+        popout_id = ChartPopoutHost.next_id
+        ChartPopoutHost.next_id += 1
+        ChartPopoutHost.on_closed[popout_id] = on_closed
+        ChartPopoutHost.send("open", popout_id, name, selections, shared_name, shared_layout)
+        return popout_id
+
+    @staticmethod
+    def close_popout(popout_id: int):
+        if ChartPopoutHost.on_closed.pop(popout_id, None) is None: return
+        ChartPopoutHost.send("close", popout_id)
+
+    @staticmethod
+    def send(*command):
+        if ChartPopoutHost.conn is None: return
+        try:
+            ChartPopoutHost.conn.send(command)
+        except OSError: pass #Handled in update when the process is found to have exited
+
+    @staticmethod
+    def update():
+        if ChartPopoutHost.process is None: #Popouts opened while the host could not be started
+            ChartPopoutHost.__close_all()
+            return
+        try:
+            while ChartPopoutHost.conn.poll(0):
+                event = ChartPopoutHost.conn.recv()
+                if event[0] == "closed":
+                    callback = ChartPopoutHost.on_closed.pop(event[1], None)
+                    if callback is not None: callback()
+        except (OSError, EOFError): pass
+
+        #Closing the viewport ends the host, so all of its popouts are closed
+        if not ChartPopoutHost.process.is_alive():
+            ChartPopoutHost.__cleanup_process()
+            cur_time = time.monotonic()
+            if cur_time - ChartPopoutHost.start_time < ChartPopoutHost.STARTUP_TIME:
+                ChartPopoutHost.failed_starts += 1
+                ChartPopoutHost.retry_time = cur_time + ChartPopoutHost.RETRY_DELAY * 2 ** (ChartPopoutHost.failed_starts - 1)
+                if ChartPopoutHost.failed_starts == ChartPopoutHost.MAX_FAILED_STARTS:
+                    Logger.log_error("The chart popout process keeps exiting on startup, popouts are disabled")
+            else:
+                ChartPopoutHost.failed_starts = 0
+            ChartPopoutHost.__close_all()
+
+    @staticmethod
+    def __close_all():
+        callbacks = list(ChartPopoutHost.on_closed.values())
+        ChartPopoutHost.on_closed.clear()
+        for callback in callbacks:
+            callback()
+
+    @staticmethod
+    def __cleanup_process():
+        ChartPopoutHost.conn.close()
+        ChartPopoutHost.process.join(timeout=1)
+        ChartPopoutHost.process = None
+        ChartPopoutHost.conn = None
+
+    @staticmethod
+    def cleanup():
+        ChartPopoutHost.shutdown = True
+        if ChartPopoutHost.process is None: return
+        ChartPopoutHost.process.terminate()
+        ChartPopoutHost.__cleanup_process()
+
 #This version of the data window takes a ThreespaceDevice and manages setting up streaming and displaying streaming results,
 #while providing configuration for pausing and such
 from devices import ThreespaceDevice, ThreespaceStreamingStatus, StreamableCommands
+from device_streaming import StreamingReader, unwrap_timestamps
 class SensorDataWindowAsync(SensorDataWindow):
 
     X_SOURCE_TIMESTAMP = 0
@@ -536,11 +796,15 @@ class SensorDataWindowAsync(SensorDataWindow):
         #Index based X Axis
         self.cur_index = 0
 
+        self.stream_reader: StreamingReader = None
+
         #Used for speed optimization by the parent window
         self.__delay_registration = False
 
     def set_pause_state(self, paused: bool):
         self.paused = paused
+        if paused:
+            self.snapshot_rendered() #Points keep being added while paused
 
     def delay_streaming_registration(self, delay: bool):
         self.__delay_registration = delay
@@ -566,7 +830,8 @@ class SensorDataWindowAsync(SensorDataWindow):
             self.clear_chart()
             if not self.__delay_registration:
                 self.device.update_streaming_settings()
-            self.device.register_streaming_callback(self.streaming_callback, hz=self.streaming_hz)
+            self.stream_reader = self.device.open_streaming_reader()
+            self.device.register_streaming_callback(self.streaming_callback, hz=self.streaming_hz, batch_only=True)
             self.set_max_points((1_000_000 / self.device.get_streaming_interval()) * 5)
             self.streaming = True
             self.last_timestamp = None
@@ -583,6 +848,7 @@ class SensorDataWindowAsync(SensorDataWindow):
             if self.x_source == self.X_SOURCE_TIMESTAMP:
                 self.device.unregister_streaming_command(self, StreamableCommands.GetTimestamp, immediate_update=not self.__delay_registration)
             self.device.unregister_streaming_callback(self.streaming_callback)
+            self.device.close_streaming_reader(self.stream_reader)
         except Exception as e:
             self.device.report_error(e)
         self.streaming = False
@@ -600,36 +866,29 @@ class SensorDataWindowAsync(SensorDataWindow):
         self.start_data_chart()
 
     def streaming_callback(self, status: ThreespaceStreamingStatus):
-        if status == ThreespaceStreamingStatus.Data:
+        if status == ThreespaceStreamingStatus.DataEnd:
             if not self.streaming: return
-            data = self.device.get_streaming_value(self.cur_option.cmd, self.cur_command_param)
+            snapshot = self.stream_reader.poll()
+            data = snapshot.get(self.cur_option.cmd, self.cur_command_param)
+            if data is None or len(snapshot) == 0: return
 
             #Get X from dynamic timestamp source
             if self.x_source in (self.X_SOURCE_HEADER_TIMESTAMP, self.X_SOURCE_TIMESTAMP):
                 if self.x_source == self.X_SOURCE_TIMESTAMP:
-                    timestamp = self.device.get_streaming_value(StreamableCommands.GetTimestamp)
+                    timestamps = snapshot.get(StreamableCommands.GetTimestamp)
                 else:
-                    timestamp = self.device.get_streaming_last_response().header.timestamp
-                    if timestamp is None: #Something disabled the header timestamp without notifying the data charts
-                        self.stop_data_chart()
-                        return
-        
-                #Handle Wrapping of timestamp
-                if self.last_timestamp is not None and timestamp < self.last_timestamp:
-                    if self.last_timestamp < 0xFFFFFFFF:
-                        self.timestamp_offset += 0xFFFFFFFF #U32 timestamp wrap
-                    else:
-                        self.timestamp_offset += 0xFFFFFFFFFFFFFFFF #U64 timestamp wrap
-                self.last_timestamp = timestamp
-                timestamp += self.timestamp_offset
-                x = timestamp / 1_000_000
+                    timestamps = snapshot.header_timestamps
+                if timestamps is None: #Something disabled the timestamp without notifying the data charts
+                    self.stop_data_chart()
+                    return
+                timestamps, self.last_timestamp, self.timestamp_offset = unwrap_timestamps(timestamps, self.last_timestamp, self.timestamp_offset)
+                x = timestamps / 1_000_000
             else:
-                x = self.cur_index
-                self.cur_index += 1
+                x = np.arange(self.cur_index, self.cur_index + len(snapshot), dtype=np.float64)
+                self.cur_index += len(snapshot)
 
-            self.add_point(x, data)
-        elif status == ThreespaceStreamingStatus.DataEnd:
-            self.update(fix_ticks=self.x_source != self.X_SOURCE_INDEX)
+            self.add_points(x, data)
+            self.queue_update(fix_ticks=self.x_source != self.X_SOURCE_INDEX)
         elif status == ThreespaceStreamingStatus.Reset:
             self.stop_data_chart()
 
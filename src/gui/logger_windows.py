@@ -4,7 +4,7 @@ Windows Specific to the Logger/General Tab
 import dearpygui.dearpygui as dpg
 from dpg_ext.global_lock import dpg_lock
 
-from dpg_ext.staged_view import StagedView, StagedTabManager
+from dpg_ext.staged_view import StagedView, StagedTabManager, LazyStagedView
 from dpg_ext.selectable_button import SelectableButton
 from dpg_ext.dynamic_button import DynamicButton
 from dpg_ext.filtered_dropdown import FilteredDropdown
@@ -41,6 +41,8 @@ class LoggerMasterWindow(StagedTabManager):
                     self.add_tab(DataLogWindow(device_manager, data_logger, log_settings).submit())
                 with dpg.tab(label="Log Config"):
                     self.add_tab(DataLogConfigWindow(device_manager, log_settings).submit())
+                with dpg.tab(label="Live Orientation"):
+                    self.add_tab(LazyStagedView(lambda: LiveOrientationWindow(device_manager)))
                 with dpg.tab(label="Orientation"):
                     self.orient_window = OrientationReplayWindow()
                     self.add_tab(self.orient_window.submit())
@@ -391,3 +393,148 @@ class LoggingSlotsConfigWindow(StagedView):
         self.__clear_device()
         self.general_menu.delete()
         self.dropdown.delete()
+
+from devices import ThreespaceStreamingStatus
+from utility import FrameUpdateScheduler
+from gui.orientation_view import OrientationGridView
+
+class LiveOrientationWindow(StagedView):
+    """
+    Shows the orientation of every connected sensor at once.
+    All sensors are rendered together by a single OrientationGridView once per frame,
+    using only the newest orientation each sensor streamed since the last frame.
+    """
+
+    TEXTURE_WIDTH = 1600
+    TEXTURE_HEIGHT = 1000
+
+    def __init__(self, device_manager: DeviceManager):
+        self.device_manager = device_manager
+        self.devices: list[ThreespaceDevice] = []
+        self.quats: dict[ThreespaceDevice,list[float]] = {}
+        self.subscribed_devices: list[ThreespaceDevice] = [] #Devices that will retry streaming when their streaming is freed up
+
+        self.opened = False
+        self.orientation_dirty = False
+        self.last_visible_frame = -1
+
+        with dpg.stage(label="Live Orientation Stage") as self._stage_id:
+            with dpg.child_window(width=-1, height=-1) as self.child_window:
+                with dpg.group(horizontal=True):
+                    dpg.add_button(label="Refresh Sensors", callback=self.__restart_viewer)
+                    self.status_text = dpg.add_text("")
+                with dpg.child_window(width=-1, height=-1, border=False, no_scrollbar=True) as self.view_window:
+                    self.grid_view = OrientationGridView(self.TEXTURE_WIDTH, self.TEXTURE_HEIGHT)
+
+        with dpg.item_handler_registry(label="Live Orientation Visible Handler") as self.visible_handler:
+            dpg.add_item_visible_handler(callback=self.__on_visible)
+        dpg.bind_item_handler_registry(self.view_window, self.visible_handler)
+
+    def __on_visible(self, sender, app_data):
+        self.grid_view.resize(*dpg.get_available_content_region(self.view_window))
+        self.last_visible_frame = dpg.get_frame_count()
+        if self.orientation_dirty:
+            FrameUpdateScheduler.request(self, self.__render_latest_orientations)
+        self.grid_view.update_image()
+
+    def __is_visible(self):
+        return self.last_visible_frame >= dpg.get_frame_count() - 1
+
+    def __render_latest_orientations(self):
+        #Every sensor is drawn in the same pass, so the GL cost per frame does not grow with the streaming rates
+        if not self.orientation_dirty or not self.__is_visible(): return
+        self.orientation_dirty = False
+        tiles = []
+        for device in self.devices:
+            try:
+                tiles.append((device.get_model(), self.quats[device], device.cached_axis_order))
+            except Exception as e:
+                device.report_error(e)
+                return
+        self.grid_view.render_image(tiles)
+        self.grid_view.update_image()
+
+    def __on_orientation_updated(self, status: ThreespaceStreamingStatus, device: ThreespaceDevice):
+        if status == ThreespaceStreamingStatus.Data:
+            self.quats[device] = device.get_streaming_value(StreamableCommands.GetTaredOrientation)
+            self.orientation_dirty = True
+            if self.__is_visible():
+                FrameUpdateScheduler.request(self, self.__render_latest_orientations)
+        elif status == ThreespaceStreamingStatus.Reset:
+            #The device stopped streaming, normally due to disconnecting
+            self.__stop_device(device)
+            self.__update_devices()
+
+    def __start_viewer(self):
+        for device in self.device_manager.threespace_manager.get_devices():
+            if not device.is_open or device.in_bootloader or device in self.devices: continue
+            #Subscribed first so devices that fail to register are retried
+            if device not in self.subscribed_devices:
+                device.reregister_stream_callback.subscribe(self.__restart_viewer)
+                self.subscribed_devices.append(device)
+            try:
+                device.cache_axis_order()
+                if not device.register_streaming_command(self, StreamableCommands.GetTaredOrientation):
+                    continue
+            except Exception as e:
+                device.report_error(e)
+                continue
+            try:
+                hertz = 33 if device.com_type == "BLE" else 100 #Same rates as the sensor orientation window
+                device.register_streaming_callback(self.__on_orientation_updated, hz=hertz, only_newest=True, user_data=device)
+            except Exception as e:
+                device.report_error(e)
+                try:
+                    device.unregister_streaming_command(self, StreamableCommands.GetTaredOrientation)
+                except Exception as e:
+                    device.report_error(e)
+                continue
+            self.devices.append(device)
+            self.quats[device] = [0, 0, 0, 1]
+        self.__update_devices()
+
+    def __stop_device(self, device: ThreespaceDevice):
+        if device not in self.devices: return
+        self.devices.remove(device)
+        del self.quats[device]
+        try:
+            device.unregister_streaming_command(self, StreamableCommands.GetTaredOrientation)
+            device.unregister_streaming_callback(self.__on_orientation_updated)
+        except Exception as e:
+            device.report_error(e)
+
+    def __stop_viewer(self):
+        for device in list(self.devices):
+            self.__stop_device(device)
+        for device in self.subscribed_devices:
+            device.reregister_stream_callback.unsubscribe(self.__restart_viewer)
+        self.subscribed_devices.clear()
+        self.__update_devices()
+
+    def __restart_viewer(self):
+        if not self.opened: return
+        #Done in the main loop since this may be called from a streaming callback
+        MainLoopEventQueue.queue_sync_event(self.__start_viewer)
+
+    def __update_devices(self):
+        self.grid_view.set_labels([device.name for device in self.devices])
+        if len(self.devices) == 0:
+            dpg.set_value(self.status_text, "No connected sensors")
+        else:
+            dpg.set_value(self.status_text, f"{len(self.devices)} sensor(s)")
+        self.orientation_dirty = True
+
+    def notify_opened(self, old_view: StagedView):
+        self.opened = True
+        self.__start_viewer()
+
+    def notify_closed(self, new_view: StagedView):
+        self.opened = False
+        self.__stop_viewer()
+
+    def delete(self):
+        FrameUpdateScheduler.cancel(self)
+        self.__stop_viewer()
+        dpg.delete_item(self.visible_handler)
+        self.grid_view.delete()
+        return super().delete()
@@ -8,6 +8,7 @@ from managers.settings_manager import SettingsManager
 
 from gui.default_window import createAboutWindow
 from gui.device_managers_ui import ThreespaceManagerToolbar
+from gui.profiler_window import FrameProfilerWindow
 
 from utility import Logger
 import traceback
@@ -36,6 +37,7 @@ class MenuBar:
             #dpg.add_menu_item(label="Discover Ports", callback=self.__discover_ports)
             dpg.add_menu_item(label="Metrics", callback=dpg.show_metrics)
             dpg.add_menu_item(label="Registry", callback=dpg.show_item_registry)
+            self.profiler_item = dpg.add_menu_item(label="Frame Profiler", check=True, callback=self.__toggle_profiler)
         
         self.ts_manager_toolbar = ThreespaceManagerToolbar(general_manager.device_manager.threespace_manager)
         with dpg.menu(label="Connection"):
@@ -49,6 +51,7 @@ class MenuBar:
         self.general_manager = general_manager
         self.device_manager = general_manager.device_manager
         self.file_explorer = None
+        self.profiler_window: FrameProfilerWindow = None
 
         self.default_theme = create_theme_imgui_default()
         self.__set_theme(None, "Default")
@@ -63,6 +66,18 @@ class MenuBar:
     def __load_start_window(self):
         self.general_manager.load_main_window()
 
+    def __toggle_profiler(self):
+        if self.profiler_window is None:
+            self.profiler_window = FrameProfilerWindow(on_close=self.__on_profiler_closed)
+        else:
+            self.profiler_window.delete()
+            self.profiler_window = None
+        dpg.set_value(self.profiler_item, self.profiler_window is not None)
+
+    def __on_profiler_closed(self):
+        self.profiler_window = None
+        dpg.set_value(self.profiler_item, False)
+
     def __set_theme(self, sender, app_data):
         if app_data == "Default":
             dpg.bind_theme(self.default_theme)
@@ -6,9 +6,114 @@ from yostlabs.graphics.dpg import DpgScene
 
 from yostlabs.math.axes import AxisOrder
 
+from utility import FrameProfiler, FrameUpdateScheduler
+
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+class AsyncTextureReadback:
+    """
+    Reads a TextureRenderer's framebuffer back to the CPU without stalling on the GPU.
+    Each read is copied into one of two pixel buffer objects and a fence is placed after it.
+    The data is only mapped once the fence has signaled, so the result of a render is
+    normally available the frame after it was started.
+
+    When read as 8 bit, a quarter of the data is transferred and converted to the float
+    RGBA DearPyGui expects on the CPU. The renderer's texture is 8 bit, so nothing is lost.
+    NOTE: All calls must happen in the main thread
+    """
+
+    NUM_BUFFERS = 2
+
+    def __init__(self, width: int, height: int, use_8bit=False):
+        self.width = width
+        self.height = height
+        self.use_8bit = use_8bit
+        self.pixel_type = GL_UNSIGNED_BYTE if use_8bit else GL_FLOAT
+        self.num_bytes = width * height * 4 * (1 if use_8bit else 4)
+
+        self.buffers = glGenBuffers(self.NUM_BUFFERS)
+        for buffer in self.buffers:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.num_bytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.fences = [None] * self.NUM_BUFFERS #(fence, start order) per buffer, None when nothing is pending
+        self.next_buffer = 0
+        self.num_started = 0
+
+        #What is handed to DPG. Rows are flipped since GL is bottom up
+        self.texture_data = np.zeros(width * height * 4, dtype=np.float32)
+
+    def start(self, renderer: TextureRenderer):
+        """Start copying the renderer's current contents. Replaces the oldest transfer if both are still pending"""
+        index = self.next_buffer
+        self.next_buffer = (index + 1) % self.NUM_BUFFERS
+        self.__discard(index)
+        with renderer:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[index])
+            glReadPixels(0, 0, self.width, self.height, GL_RGBA, self.pixel_type, ctypes.c_void_p(0))
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.fences[index] = (glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0), self.num_started)
+        self.num_started += 1
+
+    @property
+    def pending(self):
+        """True while a started transfer has not been read yet"""
+        return any(fence is not None for fence in self.fences)
+
+    def poll(self) -> np.ndarray|None:
+        """
+        Returns the texture data from the newest completed transfer, or None if no new transfer has completed.
+        The returned array is reused between calls.
+        """
+        #Transfers complete in the order they were started, so check newest first
+        pending = [i for i in range(self.NUM_BUFFERS) if self.fences[i] is not None]
+        pending.sort(key=lambda i: self.fences[i][1], reverse=True)
+        for index in pending:
+            fence = self.fences[index][0]
+            status = glClientWaitSync(fence, 0, 0)
+            if status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                continue
+            self.__copy(index)
+            #Anything older than this is out of date
+            for other in pending:
+                self.__discard(other)
+            return self.texture_data
+        return None
+
+    def __copy(self, index: int):
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[index])
+        address = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self.num_bytes, GL_MAP_READ_BIT)
+        try:
+            raw = (ctypes.c_ubyte * self.num_bytes).from_address(address)
+            if self.use_8bit:
+                pixels = np.frombuffer(raw, dtype=np.uint8).reshape(self.height, self.width * 4)
+                np.multiply(pixels[::-1], 1 / 255, out=self.texture_data.reshape(self.height, self.width * 4), casting="unsafe")
+            else:
+                pixels = np.frombuffer(raw, dtype=np.float32).reshape(self.height, self.width * 4)
+                self.texture_data.reshape(self.height, self.width * 4)[:] = pixels[::-1]
+        finally:
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    def __discard(self, index: int):
+        if self.fences[index] is None: return
+        glDeleteSync(self.fences[index][0])
+        self.fences[index] = None
+
+    def destroy(self):
+        if self.buffers is None: return
+        for i in range(self.NUM_BUFFERS):
+            self.__discard(i)
+        glDeleteBuffers(self.NUM_BUFFERS, self.buffers)
+        self.buffers = None
+
 TEXTURE_RENDERER = 0
 BASE_TEXTURE = 1
 REGISTRATION_COUNT = 2
+ORIENTATION_SCENE = 3
+MODEL = 4
 
 #Wrapper around yostlabs graphics object to reduce the number of duplicate
 #openGL and DPG resources needed. Primary reduction is via reduced TextureRenderers
@@ -23,11 +128,30 @@ class OrientationView:
     #orientation views with different texture sizes.
     REGISTERED_TEXTURES: dict[int,TextureRenderer|list|int] = {}
 
-    def __init__(self, model: OBJ, texture_width: int, texture_height: int, static_size=False, axis_compass_display=True):
+    #Map of (model, size, compass) to OrientationScenes for views created with shared_scene.
+    #All state that differs between views is applied right before each render, so a view
+    #of an already displayed model only costs its own DPG texture.
+    #The OBJs themselves are owned by the ObjectLibrary cache and are never freed here.
+    SHARED_SCENES: dict[tuple,dict[int,OrientationScene|int]] = {}
+
+    def __init__(self, model: OBJ, texture_width: int, texture_height: int, static_size=False, axis_compass_display=True, async_readback=False, readback_8bit=False, shared_scene=False):
+        """
+        async_readback - Render results are read back from the GPU without waiting, polled from the FrameUpdateScheduler
+        and displayed on a later update_image call. This requires update_image to keep being called after rendering, such as from a visible handler.
+        readback_8bit - Transfer async readbacks as 8 bit instead of float
+        shared_scene - Render with a scene shared with other views of the same model and size. The orientation_scene
+        must then not be modified outside of this class.
+        """
         self.static_size = static_size
         self.size = (texture_width, texture_height)
-        self.orientation_scene = OrientationScene(texture_width, texture_height, model=ModelObject(model=model), font=GL_Context.default_font)
-        self.orientation_scene.orientation_indicator.set_visible(axis_compass_display)
+        self.axis_compass_display = axis_compass_display
+        self.aspect_ratio = texture_width / texture_height
+        self.shared_scene_key = None
+        if shared_scene:
+            self.orientation_scene = self.__acquire_shared_scene(model)
+        else:
+            self.orientation_scene = OrientationScene(texture_width, texture_height, model=ModelObject(model=model), font=GL_Context.default_font)
+            self.orientation_scene.orientation_indicator.set_visible(axis_compass_display)
         self.dirty = False
         self.deleted = False
 
@@ -49,6 +173,9 @@ class OrientationView:
             OrientationView.REGISTERED_TEXTURES[self.size][REGISTRATION_COUNT] += 1
             self.dpg_scene = DpgScene(texture_width, texture_height, self.orientation_scene, renderer=self.renderer)
         
+        self.readback = AsyncTextureReadback(texture_width, texture_height, use_8bit=readback_8bit) if async_readback else None
+        self.readback_data = None
+
         with dpg.texture_registry() as self.texture_registry:
             self.texture = dpg.add_raw_texture(width=texture_width, height=texture_height, default_value=self.base_texture, format=dpg.mvFormat_Float_rgba)
         
@@ -57,9 +184,36 @@ class OrientationView:
         else:
             self.image = dpg.add_image(self.texture)
 
+    def __acquire_shared_scene(self, model: OBJ):
+        self.shared_scene_key = (id(model), self.size, self.axis_compass_display)
+        if self.shared_scene_key in OrientationView.SHARED_SCENES:
+            registration = OrientationView.SHARED_SCENES[self.shared_scene_key]
+            registration[REGISTRATION_COUNT] += 1
+            return registration[ORIENTATION_SCENE]
+
+        scene = OrientationScene(*self.size, model=ModelObject(model=model), font=GL_Context.default_font)
+        scene.orientation_indicator.set_visible(self.axis_compass_display)
+        OrientationView.SHARED_SCENES[self.shared_scene_key] = { ORIENTATION_SCENE: scene, MODEL: model, REGISTRATION_COUNT: 1 }
+        return scene
+
+    def __release_shared_scene(self):
+        registration = OrientationView.SHARED_SCENES[self.shared_scene_key]
+        registration[REGISTRATION_COUNT] -= 1
+        if registration[REGISTRATION_COUNT] == 0:
+            registration[ORIENTATION_SCENE].destroy()
+            del OrientationView.SHARED_SCENES[self.shared_scene_key]
+        self.shared_scene_key = None
+
     def set_model(self, model: OBJ):
-        self.orientation_scene.set_model(ModelObject(model=model))
+        if self.shared_scene_key is None:
+            self.orientation_scene.set_model(ModelObject(model=model))
+            return
+        if self.shared_scene_key[0] == id(model): return
+        self.__release_shared_scene()
+        self.orientation_scene = self.__acquire_shared_scene(model)
+        self.dpg_scene.scene = self.orientation_scene
 
+    @FrameProfiler.timed("Orientation Render")
     def render_image(self, quat: list[float], axis_order: AxisOrder, hide_sensor=False, hide_arrows=False):
         """
         Params
@@ -73,19 +227,42 @@ class OrientationView:
         self.orientation_scene.axes.set_active(not hide_arrows)
         self.orientation_scene.set_axis_order(axis_order)
         self.orientation_scene.set_model_rotation_quat(quat)
+        self.orientation_scene.camera.set_perspective(aspect_ratio=self.aspect_ratio)
 
         #Actually render the image
         self.dpg_scene.render()
+        if self.readback is not None:
+            #Must start before another view sharing the renderer draws over it
+            self.readback.start(self.renderer)
+            FrameUpdateScheduler.request(self.readback, self.__poll_readback)
+            return
         self.dirty = True
         #Caches the texture data. This is done to ensure the data is cached during the main thread.
         #Doing OpenGL calls during a DPG thread, which is allowed to call update_image which calls this,
         #would error due to OpenGL calls not being allowed in DPG threads.
         self.dpg_scene.get_texture_data()
 
+    def __poll_readback(self):
+        #Polled from the main loop since update_image may be called from DPG's thread, where GL calls fail
+        texture_data = self.readback.poll()
+        if texture_data is None:
+            if self.readback.pending: #Check again next frame
+                FrameUpdateScheduler.request(self.readback, self.__poll_readback)
+            return
+        self.readback_data = texture_data
+        self.dirty = True
+
     def update_image(self):
         if not self.static_size:
-            self.dpg_scene.scale_to_image(self.image)
+            #Applied on the next render, the camera may be shared with other views
+            width, height = dpg.get_item_rect_size(self.image)
+            if height > 0:
+                self.aspect_ratio = width / height
         if not self.dirty: return
+        if self.readback is not None:
+            dpg.set_value(self.texture, self.readback_data)
+            self.dirty = False
+            return
         self.dpg_scene.update_dpg_texture(self.texture)
         self.dirty = False
     
@@ -94,11 +271,158 @@ class OrientationView:
         if dpg.does_item_exist(self.image):
             dpg.delete_item(self.image)
         dpg.delete_item(self.texture_registry)
-        self.dpg_scene.destroy()
+        if self.readback is not None:
+            FrameUpdateScheduler.cancel(self.readback)
+            self.readback.destroy()
+        if self.shared_scene_key is None:
+            self.dpg_scene.destroy()
+        else:
+            self.__release_shared_scene()
         OrientationView.REGISTERED_TEXTURES[self.size][REGISTRATION_COUNT] -= 1
 
         #Clean up the registration
         if OrientationView.REGISTERED_TEXTURES[self.size][REGISTRATION_COUNT] == 0:
             renderer: TextureRenderer = OrientationView.REGISTERED_TEXTURES[self.size][TEXTURE_RENDERER]
             renderer.destroy()
-            del OrientationView.REGISTERED_TEXTURES[self.size]
\ No newline at end of file
+            del OrientationView.REGISTERED_TEXTURES[self.size]
+
+
+class OrientationGridView:
+    """
+    Displays the orientation of many sensors as tiles of a single image.
+    Every tile is drawn into one framebuffer with its own viewport, so each render is
+    one framebuffer pass, one readback and one DPG texture update regardless of the number of tiles.
+    The tiles are laid out to best fill the size given to resize.
+    NOTE: GL rendering MUST happen in the main thread
+    """
+
+    TILE_SPACING = 2 #Pixels of background left between tiles in the texture
+    LABEL_SIZE = 16
+
+    def __init__(self, texture_width: int, texture_height: int):
+        self.size = (texture_width, texture_height)
+        self.renderer = TextureRenderer(texture_width, texture_height)
+        self.readback = AsyncTextureReadback(texture_width, texture_height, use_8bit=True)
+
+        #One scene per model, rendered once per tile using that model
+        self.scenes: dict[int,OrientationScene] = {}
+
+        self.labels: list[str] = []
+        self.readback_data = None
+        self.dirty = False
+        self.display_size = (texture_width, texture_height)
+        self.num_cols = 1
+        self.num_rows = 1
+
+        with dpg.texture_registry() as self.texture_registry:
+            self.texture = dpg.add_raw_texture(width=texture_width, height=texture_height, default_value=np.zeros(texture_width * texture_height * 4, dtype=np.float32), format=dpg.mvFormat_Float_rgba)
+        self.drawlist = dpg.add_drawlist(width=texture_width, height=texture_height)
+        self.deleted = False
+        self.__draw()
+
+    def set_labels(self, labels: list[str]):
+        """Sets the number of tiles and the text shown on each"""
+        if labels == self.labels: return
+        self.labels = list(labels)
+        self.__layout()
+
+    def resize(self, width: int, height: int):
+        width, height = max(1, int(width)), max(1, int(height))
+        if (width, height) == self.display_size: return
+        self.display_size = (width, height)
+        self.__layout()
+
+    def __layout(self):
+        #Choose the column count that gives the largest tiles for the displayed size
+        count = max(1, len(self.labels))
+        width, height = self.display_size
+        best_size = -1
+        for cols in range(1, count + 1):
+            rows = (count + cols - 1) // cols
+            tile_size = min(width / cols, height / rows)
+            if tile_size > best_size:
+                best_size = tile_size
+                self.num_cols, self.num_rows = cols, rows
+        self.__draw()
+
+    def __draw(self):
+        width, height = self.display_size
+        dpg.configure_item(self.drawlist, width=width, height=height)
+        dpg.delete_item(self.drawlist, children_only=True)
+        dpg.draw_image(self.texture, (0, 0), (width, height), parent=self.drawlist)
+        tile_width, tile_height = width / self.num_cols, height / self.num_rows
+        for i, label in enumerate(self.labels):
+            row, col = divmod(i, self.num_cols)
+            dpg.draw_text((col * tile_width + 6, row * tile_height + 4), label, size=self.LABEL_SIZE, parent=self.drawlist)
+
+    def __get_scene(self, model: OBJ):
+        scene = self.scenes.get(id(model), None)
+        if scene is None:
+            scene = OrientationScene(*self.size, model=ModelObject(model=model), font=GL_Context.default_font)
+            scene.orientation_indicator.set_visible(False) #Too small to be useful in a tile
+            self.scenes[id(model)] = scene
+        return scene
+
+    @FrameProfiler.timed("Orientation Grid Render")
+    def render_image(self, tiles: list[tuple[OBJ,list[float],AxisOrder]]):
+        """
+        Params
+        ------
+        tiles - The (model, quat, axis_order) to display in each tile, in the same order as the labels
+        """
+        texture_width, texture_height = self.size
+        tile_width = texture_width // self.num_cols
+        tile_height = texture_height // self.num_rows
+        #The texture is stretched to the display size, so each tile is shown at the display's tile aspect ratio
+        display_width, display_height = self.display_size
+        aspect_ratio = (display_width / self.num_cols) / (display_height / self.num_rows)
+
+        with self.renderer:
+            glClearColor(0, 0, 0, 1)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            glEnable(GL_SCISSOR_TEST)
+            for i, (model, quat, axis_order) in enumerate(tiles[:self.num_cols * self.num_rows]):
+                row, col = divmod(i, self.num_cols)
+                #GL is bottom up, the first row is at the top of the image
+                x = col * tile_width + self.TILE_SPACING // 2
+                y = texture_height - (row + 1) * tile_height + self.TILE_SPACING // 2
+                width, height = tile_width - self.TILE_SPACING, tile_height - self.TILE_SPACING
+
+                scene = self.__get_scene(model)
+                scene.camera.set_viewport(width, height, x, y)
+                scene.camera.set_perspective(aspect_ratio=aspect_ratio)
+                scene.set_axis_order(axis_order)
+                scene.set_model_rotation_quat(quat)
+                GL_Context.current_surface.apply_scissor(x, y, width, height)
+                scene.render()
+            glDisable(GL_SCISSOR_TEST)
+        self.readback.start(self.renderer)
+        FrameUpdateScheduler.request(self.readback, self.__poll_readback)
+
+    def __poll_readback(self):
+        #Polled from the main loop since update_image may be called from DPG's thread, where GL calls fail
+        texture_data = self.readback.poll()
+        if texture_data is None:
+            if self.readback.pending:
+                FrameUpdateScheduler.request(self.readback, self.__poll_readback)
+            return
+        self.readback_data = texture_data
+        self.dirty = True
+
+    def update_image(self):
+        if not self.dirty: return
+        dpg.set_value(self.texture, self.readback_data)
+        self.dirty = False
+
+    def delete(self):
+        if self.deleted: return
+        if dpg.does_item_exist(self.drawlist):
+            dpg.delete_item(self.drawlist)
+        dpg.delete_item(self.texture_registry)
+        for scene in self.scenes.values():
+            scene.destroy()
+        self.scenes.clear()
+        FrameUpdateScheduler.cancel(self.readback)
+        self.readback.destroy()
+        self.renderer.destroy()
+        self.deleted = True
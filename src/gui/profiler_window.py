@@ -0,0 +1,103 @@
+"""
+Window showing where the main loop and callbacks spend their time, see FrameProfiler
+"""
+import dearpygui.dearpygui as dpg
+
+from utility import FrameProfiler, Logger
+from managers.resource_manager import PLATFORM_FOLDERS
+
+import numpy as np
+import datetime
+import time
+
+class FrameProfilerWindow:
+    """
+    Profiling is enabled while this window exists.
+    Shows the recent statistics of each section and a histogram of the selected section.
+    """
+
+    REFRESH_PERIOD = 0.25 #Seconds
+    STATS_PERIOD = 1 #Seconds of history the table covers
+    NUM_BINS = 30
+
+    def __init__(self, on_close=None):
+        self.on_close = on_close
+        self.selected_section = "Render"
+        self.last_refresh_time = 0
+
+        with dpg.window(label="Frame Profiler", width=640, height=560, on_close=self.__on_close) as self.window:
+            with dpg.group(horizontal=True):
+                dpg.add_button(label="Reset", callback=self.__on_reset)
+                dpg.add_button(label="Export Trace", callback=self.__on_export)
+                self.status_text = dpg.add_text("")
+            with dpg.table(header_row=True, height=280, scrollY=True, borders_innerV=True, row_background=True) as self.table:
+                dpg.add_table_column(label="Section", width_stretch=True, init_width_or_weight=0.4)
+                for label in ("Calls/s", "Mean (ms)", "P95 (ms)", "Max (ms)", "Load (%)"):
+                    dpg.add_table_column(label=label, width_stretch=True, init_width_or_weight=0.12)
+            with dpg.plot(label="Render", height=-1, width=-1) as self.plot:
+                self.x_axis = dpg.add_plot_axis(dpg.mvXAxis, label="Duration (ms)", auto_fit=True)
+                with dpg.plot_axis(dpg.mvYAxis, label="Count", auto_fit=True):
+                    self.histogram = dpg.add_bar_series([], [])
+
+        with dpg.item_handler_registry(label="Frame Profiler Visible Handler") as self.visible_handler:
+            dpg.add_item_visible_handler(callback=self.__on_visible)
+        dpg.bind_item_handler_registry(self.window, self.visible_handler)
+
+        FrameProfiler.set_enabled(True)
+
+    def __on_visible(self):
+        cur_time = time.perf_counter()
+        if cur_time - self.last_refresh_time < self.REFRESH_PERIOD: return
+        self.last_refresh_time = cur_time
+        self.__refresh_table()
+        self.__refresh_histogram()
+
+    def __refresh_table(self):
+        dpg.delete_item(self.table, children_only=True, slot=1) #Only the rows
+        for name, calls, mean, p95, maximum, load in FrameProfiler.get_stats(self.STATS_PERIOD):
+            with dpg.table_row(parent=self.table):
+                dpg.add_selectable(label=name, span_columns=True, default_value=name == self.selected_section,
+                                   callback=self.__on_section_selected, user_data=name)
+                dpg.add_text(f"{calls / self.STATS_PERIOD:.0f}")
+                dpg.add_text(f"{mean * 1000:.3f}")
+                dpg.add_text(f"{p95 * 1000:.3f}")
+                dpg.add_text(f"{maximum * 1000:.3f}")
+                dpg.add_text(f"{load * 100:.1f}")
+
+    def __refresh_histogram(self):
+        dpg.configure_item(self.plot, label=self.selected_section)
+        durations = np.array(FrameProfiler.get_durations(self.selected_section)) * 1000
+        if len(durations) == 0:
+            dpg.configure_item(self.histogram, x=[], y=[])
+            return
+        counts, edges = np.histogram(durations, bins=self.NUM_BINS)
+        width = edges[1] - edges[0]
+        dpg.configure_item(self.histogram, x=(edges[:-1] + width / 2).tolist(), y=counts.tolist(), weight=width)
+
+    def __on_section_selected(self, sender, app_data, user_data):
+        self.selected_section = user_data
+        self.last_refresh_time = 0 #Show the change right away
+
+    def __on_reset(self):
+        FrameProfiler.reset()
+
+    def __on_export(self):
+        path = PLATFORM_FOLDERS.user_log_path / f"trace_{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+        try:
+            FrameProfiler.export_chrome_trace(path)
+        except Exception as e:
+            Logger.log_error(f"Failed to export trace: {e}")
+            return
+        Logger.log_info(f"Exported trace to {path.as_posix()}")
+        dpg.set_value(self.status_text, f"Saved {path.name}")
+
+    def __on_close(self):
+        self.delete()
+        if self.on_close is not None:
+            self.on_close()
+
+    def delete(self):
+        FrameProfiler.set_enabled(False)
+        dpg.delete_item(self.visible_handler)
+        if dpg.does_item_exist(self.window):
+            dpg.delete_item(self.window)
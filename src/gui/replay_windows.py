@@ -288,7 +288,7 @@ class OrientationReplayWindow(StagedView):
                 self.grid.offsets = 8, 8, 8, 8
                 self.grid.rows[1].configure(size=56)
 
-                self.orientation_viewer = OrientationView(ObjectLibrary.getObjFromSerialNumber(None), self.TEXTURE_WIDTH, self.TEXTURE_HEIGHT)
+                self.orientation_viewer = OrientationView(ObjectLibrary.getObjFromSerialNumber(None), self.TEXTURE_WIDTH, self.TEXTURE_HEIGHT, async_readback=True, readback_8bit=True, shared_scene=True)
                 self.grid.push(self.orientation_viewer.image, 0, 0)
                 with dpg.child_window(border=False) as self.timeline_window:
                     dpg.add_spacer()
@@ -435,6 +435,11 @@ class DataChartReplayWindow(StagedView):
 
         self.data_file: TssDataFile = None
 
+        #Chartable data from the data file, converted once on load so rendering is just slicing.
+        #Each option is a C-contiguous float64 array with a row per channel.
+        self.channel_data: dict[ThreespaceStreamingOption,np.ndarray] = {}
+        self.x_time: np.ndarray = None
+
         with dpg.stage() as self._stage_id:
             #Configuration Menu
             with dpg.child_window(width=-1, height=-1, menubar=True) as self.window:
@@ -523,28 +528,19 @@ class DataChartReplayWindow(StagedView):
 
         #Compute the X Axis that is shared for all the windows
         min_index = max(0, index - self.max_points + 1)
-        index_range = range(min_index, index+1)
-        time_based = self.data_file.has_monotime
-        if time_based:
-            x_axis = self.data_file.monotime[min_index:index+1]
+        if self.x_time is not None:
+            x_axis = self.x_time[min_index:index+1]
         else:
-            x_axis = list(index_range)
+            x_axis = np.arange(min_index, index+1, dtype=np.float64)
 
         #Compute and set the axis for all the windows
         for window in windows:
             option, param = window.get_option()
             if option is None: continue
             option = ThreespaceStreamingOption(option.cmd, param)
-            y_data = self.data_file.data[option][min_index:index+1]
-
-            #Format for DPG
-            if y_data.dtype == np.int64: #Int64 type does not play nice with DPG
-                y_data = y_data.astype(np.float64)
-            if len(y_data.shape) == 1: #The input needs to be an array of vectors. Single Elements (like timestamp) aren't vectors by default
-                y_data = np.expand_dims(y_data, 1)
-
-            y_data = np.ascontiguousarray(y_data.T)
-            window.set_axes(x_axis, y_data)
+            y_data = self.channel_data.get(option, None)
+            if y_data is None: continue
+            window.set_axes(x_axis, y_data[:,min_index:index+1])
             window.update(fix_ticks=False)
 
     def queue_render(self):
@@ -552,6 +548,19 @@ class DataChartReplayWindow(StagedView):
         self.render_queued = True
         MainLoopEventQueue.queue_sync_event(self.__render_plots_queue)
 
+    def __load_channel_data(self):
+        self.channel_data.clear()
+        self.x_time = None
+        if self.data_file is None: return
+        for option, data in self.data_file.data.items():
+            if data.dtype.kind not in "iuf": continue #Strings can't be charted
+            if data.ndim == 1: #Single Elements (like timestamp) aren't vectors by default
+                data = np.expand_dims(data, 1)
+            #Int64 type does not play nice with DPG, and each channel needs to be contiguous for slicing
+            self.channel_data[option] = np.ascontiguousarray(data.T, dtype=np.float64)
+        if self.data_file.has_monotime:
+            self.x_time = np.ascontiguousarray(self.data_file.monotime, dtype=np.float64)
+
     def __render_plots_queue(self):
         self.render_current_index()
         self.render_queued = False
@@ -561,6 +570,7 @@ class DataChartReplayWindow(StagedView):
         Must be called from main thread
         """
         self.data_file = data_file
+        self.__load_channel_data()
         self.set_default()
         if self.data_file is None or len(data_file) == 0: return
 
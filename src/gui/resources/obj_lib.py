@@ -8,6 +8,119 @@ from managers.settings_manager import SettingsManager
 from yostlabs.tss3.consts import *
 
 import time
+import threading
+import hashlib
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+class CachedOBJ(OBJ):
+    """
+    An OBJ restored from the already generated vertex and index buffers instead of parsing the model file.
+    Only the data needed for rendering and the bounding boxes is restored.
+    """
+
+    FLOATS_PER_VERTEX = 11 #pos(3) + normal(3) + texcoord(2) + color(3), matching OBJ.generate
+
+    def __init__(self, interleaved: np.ndarray, indices: np.ndarray, bbox_min: np.ndarray, bbox_max: np.ndarray, scale=1):
+        #Intentionally not calling the base init, it parses the file
+        self.vertices = []
+        self.normals = []
+        self.texcoords = []
+        self.faces = []
+        self.mtl = {}
+        self.generated = False
+        self.scale = scale
+        self.swapyz = False
+
+        self.vao = None
+        self.vbo = None
+        self.ebo = None
+        self.interleaved = np.ascontiguousarray(interleaved, dtype=np.float32)
+        self.indices = np.ascontiguousarray(indices, dtype=np.uint32)
+        self.vertex_count = len(self.interleaved)
+        self.index_count = len(self.indices)
+
+        self.local_bbox_min = bbox_min
+        self.local_bbox_max = bbox_max
+        self.local_bbox_center = (bbox_min + bbox_max) / 2.0
+        self.local_bbox_size = bbox_max - bbox_min
+        origin = np.zeros(3)
+        self.global_bbox_min = np.minimum(bbox_min, origin)
+        self.global_bbox_max = np.maximum(bbox_max, origin)
+        self.global_bbox_center = (self.global_bbox_min + self.global_bbox_max) / 2.0
+        self.global_bbox_size = self.global_bbox_max - self.global_bbox_min
+
+    def generate(self):
+        """Same buffer layout as OBJ.generate, just without building the data"""
+        if self.generated: return
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.interleaved.nbytes, self.interleaved, GL_STATIC_DRAW)
+        stride = self.FLOATS_PER_VERTEX * 4
+        for location, size, offset in ((0, 3, 0), (1, 3, 12), (2, 2, 24), (3, 3, 32)):
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+
+        self.ebo = glGenBuffers(1)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+
+        glBindVertexArray(0)
+        self.generated = True
+
+class ModelCache:
+    """
+    Stores the generated buffers of models as .npz files so they only have to be parsed from
+    the model file once. Entries are keyed by the model path, its modification time and the scale,
+    so editing or replacing a model file causes it to be parsed again.
+    """
+
+    FOLDER = PLATFORM_FOLDERS.user_cache_path / "models"
+    VERSION = 1 #Increment if the layout of the cached buffers changes
+
+    @classmethod
+    def __getCachePath(cls, path: pathlib.Path, scale: float):
+        key = f"{cls.VERSION}|{path.resolve().as_posix()}|{path.stat().st_mtime_ns}|{scale}"
+        return cls.FOLDER / f"{path.stem}_{hashlib.sha1(key.encode()).hexdigest()[:16]}.npz"
+
+    @classmethod
+    def load(cls, path: pathlib.Path, scale: float):
+        """Returns a CachedOBJ, or None if the model is not cached. Does not do any OpenGL calls"""
+        try:
+            cache_path = cls.__getCachePath(path, scale)
+            if not cache_path.exists(): return None
+            with np.load(cache_path) as cached:
+                return CachedOBJ(cached["interleaved"], cached["indices"], cached["bbox_min"], cached["bbox_max"], scale=scale)
+        except Exception as e: #A bad cache entry should never prevent loading the model
+            print(f"Failed to load cached model for {path}: {e}")
+            return None
+
+    @classmethod
+    def save(cls, obj: OBJ, path: pathlib.Path, scale: float):
+        """Caches an OBJ that has already been generated. Must be called from the thread with the GL context"""
+        try:
+            interleaved = np.empty((obj.vertex_count, CachedOBJ.FLOATS_PER_VERTEX), dtype=np.float32)
+            indices = np.empty(obj.index_count, dtype=np.uint32)
+            #Read the buffers back from the GPU since OBJ.generate does not keep them
+            glBindBuffer(GL_ARRAY_BUFFER, obj.vbo)
+            glGetBufferSubData(GL_ARRAY_BUFFER, 0, interleaved.nbytes, interleaved)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindVertexArray(obj.vao) #The element buffer binding is part of the VAO state
+            glGetBufferSubData(GL_ELEMENT_ARRAY_BUFFER, 0, indices.nbytes, indices)
+            glBindVertexArray(0)
+
+            cls.FOLDER.mkdir(parents=True, exist_ok=True)
+            cache_path = cls.__getCachePath(path, scale)
+            temp_path = cache_path.with_suffix(".tmp.npz")
+            np.savez(temp_path, interleaved=interleaved, indices=indices,
+                     bbox_min=np.asarray(obj.local_bbox_min, dtype=np.float64), bbox_max=np.asarray(obj.local_bbox_max, dtype=np.float64))
+            temp_path.replace(cache_path) #So a partially written file is never loaded
+        except Exception as e:
+            print(f"Failed to cache model {path}: {e}")
 
 class ObjectLibrary:
 
@@ -17,6 +130,8 @@ class ObjectLibrary:
     @classmethod
     def init(cls):
         cls.obj_cache: dict[str,OBJ] = {}
+        cls.prewarmed: dict[str,OBJ] = {} #Loaded by the prewarm thread, but not generated yet since that requires the GL context
+        cls.prewarm_thread: threading.Thread = None
 
         cls.config = SettingsManager.load("sensor_models.json", folder=OBJECT_FOLDER)
         cls.mappings: dict[str|int,dict[str|int,str]] = cls.config["Mapping"]
@@ -71,6 +186,22 @@ class ObjectLibrary:
         if name in cls.obj_cache:
             return cls.obj_cache[name]
 
+        final_path, scale = cls.__getModelPath(name)
+
+        print("Loading Model:", final_path)
+        start_time = time.perf_counter()
+        obj = cls.prewarmed.pop(name, None) or cls.__loadModel(final_path, scale)
+        obj.generate()
+        if not isinstance(obj, CachedOBJ):
+            ModelCache.save(obj, final_path, scale)
+        end_time = time.perf_counter()
+        print(f"Total Load Time: {end_time - start_time}")
+        cls.obj_cache[name] = obj
+
+        return obj
+
+    @classmethod
+    def __getModelPath(cls, name: str):
         if name in cls.models:
             base_path = cls.models[name].get("Path", cls.DEFAULT_MODEL_PATH)
             scale = cls.models[name].get("Scale", 1)
@@ -80,24 +211,42 @@ class ObjectLibrary:
 
         absolute_path = cls.__toAbsolute(base_path)
         if absolute_path.exists():
-            final_path = absolute_path
-        else:
-            #If the supplied path is not part of the application resources/user supplied,
-            #check the graphics library resources for it.
-            final_path = resources.get_model_path(base_path).absolute()
-            if not final_path.exists():
-                raise FileNotFoundError(f"Model file not found for model {name} at either {absolute_path} or {final_path}")
-
-        print("Loading Model:", final_path)
-        start_time = time.perf_counter()
-        obj = OBJ(final_path, scale=scale)
-        obj.generate()
-        end_time = time.perf_counter()
-        print(f"Total Load Time: {end_time - start_time}")
-        cls.obj_cache[name] = obj
+            return absolute_path, scale
+        #If the supplied path is not part of the application resources/user supplied,
+        #check the graphics library resources for it.
+        final_path = resources.get_model_path(base_path).absolute()
+        if not final_path.exists():
+            raise FileNotFoundError(f"Model file not found for model {name} at either {absolute_path} or {final_path}")
+        return final_path, scale
 
+    @classmethod
+    def __loadModel(cls, path: pathlib.Path, scale: float):
+        """Loads the model without generating it. Safe to call outside the main thread"""
+        obj = ModelCache.load(path, scale)
+        if obj is None:
+            obj = OBJ(path, scale=scale)
         return obj
 
+    @classmethod
+    def startPrewarm(cls):
+        """
+        Loads every model in the background so the first sensor of a new family does not have to wait on parsing.
+        Generating still happens on first use since it requires the GL context.
+        """
+        if cls.prewarm_thread is not None: return
+        cls.prewarm_thread = threading.Thread(target=cls.__prewarm, daemon=True)
+        cls.prewarm_thread.start()
+
+    @classmethod
+    def __prewarm(cls):
+        for name in cls.getAvailableModelNames():
+            if name in cls.obj_cache or name in cls.prewarmed: continue
+            try:
+                path, scale = cls.__getModelPath(name)
+                cls.prewarmed[name] = cls.__loadModel(path, scale)
+            except Exception as e:
+                print(f"Failed to prewarm model {name}: {e}")
+
     @classmethod
     def getObjFromSerialNumber(cls, sn: int):
         modelname = cls.getModelNameFromSerialNumber(sn)
@@ -3,12 +3,12 @@ import dpg_ext.extension_functions as dpg_ext
 from dpg_ext.log_window import MultilineText
 from dpg_ext.selectable_button import SelectableButton
 from dpg_ext.filtered_dropdown import FilteredDropdown
-from dpg_ext.staged_view import StagedView, StagedTabManager
+from dpg_ext.staged_view import StagedView, StagedTabManager, LazyStagedView
 from dpg_ext.global_lock import dpg_lock
 
 from devices import ThreespaceDevice, StreamableCommands, ThreespaceStreamingManager, ThreespaceStreamingStatus, threespace_consts, ThreespaceStreamingOption
 from yostlabs.tss3.utils.calibration import ThreespaceGradientDescentCalibration, ThreespaceSphereCalibration
-from utility import Logger, MainLoopEventQueue
+from utility import Logger, MainLoopEventQueue, FrameUpdateScheduler, FrameProfiler
 
 from dataclasses import dataclass, field
 from typing import Callable
@@ -86,30 +86,40 @@ class SensorMasterWindow(StagedTabManager):
                     dpg.add_theme_color(dpg.mvThemeCol_TabActive, (0, 0, 0, 0))                    
 
         with dpg.stage(label="Sensor Master Stage") as self._stage_id:
-            with dpg.child_window(width=-1, height=-1, border=False) as self.child_window: #This way, the visuals can be edited without having to reload the stage
-                self.connection_window = SensorConnectionWindow(threespace_device, self.on_sensor_opened)
-                self.connection_window.submit()
+            #This way, the visuals can be edited without having to reload the stage
+            self.child_window = dpg.add_child_window(width=-1, height=-1, border=False)
 
-        #On connection, the actual window will be loaded
+        #The connection window is built the first time this sensor is selected, so detected sensors
+        #that are never looked at only cost a banner. On connection, the actual window will be loaded
+        self.connection_window: SensorConnectionWindow = None
         self.macro_manager = macro_manager
         self.device = threespace_device
 
+    def notify_opened(self, old_view: StagedView):
+        if self.staged_view_dict is None and self.connection_window is None:
+            self.connection_window = SensorConnectionWindow(self.device, self.on_sensor_opened)
+            self.connection_window.submit(self.child_window)
+        super().notify_opened(old_view)
+
     def load_firmware_windows(self):
         dpg.push_container_stack(self.child_window)
         with dpg.tab_bar(label="Sensor Tabs"):
             self.set_tab_bar(dpg.top_container_stack())
+            #Tab contents are built the first time the tab is opened
             with dpg.tab(label="Orientation") as self.main_tab:
-                self.add_tab(SensorOrientationWindow(self.device).submit())
+                self.add_tab(LazyStagedView(lambda: SensorOrientationWindow(self.device)))
             with dpg.tab(label="Terminal"):
-                self.add_tab(SensorTerminalWindow(self.device, self.macro_manager).submit())                   
+                self.add_tab(LazyStagedView(lambda: SensorTerminalWindow(self.device, self.macro_manager)))
             with dpg.tab(label="Data Charts"):
-                self.add_tab(SensorDataChartsWindow(self.device).submit())
+                self.add_tab(LazyStagedView(lambda: SensorDataChartsWindow(self.device)))
             with dpg.tab(label="EEPTS"):
-                self.add_tab(EeptsWindow(self.device).submit())       
+                self.add_tab(LazyStagedView(lambda: EeptsWindow(self.device)))
             with dpg.tab(label="Calibration"):
-                self.add_tab(SensorCalibrationWindow(self.device).submit())
+                self.add_tab(LazyStagedView(lambda: SensorCalibrationWindow(self.device)))
             with dpg.tab(label="Settings"):
-                self.add_tab(SensorSettingsWindow(self.device).submit())
+                self.add_tab(LazyStagedView(lambda: SensorSettingsWindow(self.device)))
+            with dpg.tab(label="Stream Health"):
+                self.add_tab(LazyStagedView(lambda: StreamingHealthWindow(self.device)))
             dpg.add_tab_button(label="          ")
             dpg.bind_item_theme(dpg.last_item(), SensorMasterWindow.INVISIBLE_THEME)
             dpg.add_tab_button(label="Disconnect", callback=self.__disconnect_selected)
@@ -471,6 +481,7 @@ class SensorTerminalWindow(StagedView):
         except Exception as e:
             self.device.report_error(e)
 
+    @FrameProfiler.timed("Terminal Read")
     def __read_terminal(self):
         if self.device.is_api_streaming():
             return
@@ -536,7 +547,7 @@ class SensorOrientationWindow(StagedView):
                 self.grid.cols[1].configure(size=command_window_width) #Settings bar is a static size
                 self.grid.offsets = 8, 8, 8, 8 #Compensating for title bar and scrollbar
                 
-                self.orientation_viewer = OrientationView(device.get_model(), self.TEXTURE_WIDTH, self.TEXTURE_HEIGHT)
+                self.orientation_viewer = OrientationView(device.get_model(), self.TEXTURE_WIDTH, self.TEXTURE_HEIGHT, async_readback=True, readback_8bit=True, shared_scene=True)
                 with dpg.child_window(border=False) as control_window:
                     logo_image = dpg.add_image(texture_lib.logo_texture.texture)
                     with dpg.child_window(label="Components") as components_enabled_window:
@@ -604,8 +615,8 @@ class SensorOrientationWindow(StagedView):
         dpg.bind_item_handler_registry(self.interval_drag, self.edited_handler)
 
         self.reload_dynamic_settings()
-        self.pixels_dirty = False
-        self.pixels = None
+        self.orientation_dirty = False #A new orientation has been received that has not been rendered yet
+        self.last_visible_frame = -1
 
         self.device.reregister_stream_callback.subscribe(self.__restart_viewer)
 
@@ -633,6 +644,19 @@ class SensorOrientationWindow(StagedView):
     def __on_visible(self, sender, app_data):
         self.grid()
         self.grid2()
+        self.last_visible_frame = dpg.get_frame_count()
+        if self.orientation_dirty: #Received while hidden, so was never queued
+            FrameUpdateScheduler.request(self, self.__render_latest_orientation)
+        self.orientation_viewer.update_image()
+
+    def __is_visible(self):
+        return self.last_visible_frame >= dpg.get_frame_count() - 1
+
+    def __render_latest_orientation(self):
+        #Only the newest orientation received before the frame is rendered, so GL work is bound by the frame rate instead of the streaming rate
+        if not self.orientation_dirty or not self.__is_visible(): return
+        self.orientation_dirty = False
+        self.render_image()
         self.orientation_viewer.update_image()
 
     def __on_hide_sensor(self, sender, app_data, user_data):
@@ -662,7 +686,9 @@ class SensorOrientationWindow(StagedView):
     def __on_orientation_updated(self, status: ThreespaceStreamingStatus):
         if status == ThreespaceStreamingStatus.Data:
             self.quat = self.device.get_streaming_value(StreamableCommands.GetTaredOrientation)
-            self.render_image()
+            self.orientation_dirty = True
+            if self.__is_visible():
+                FrameUpdateScheduler.request(self, self.__render_latest_orientation)
         elif status == ThreespaceStreamingStatus.Reset:
             self.__stop_viewer()
 
@@ -714,6 +740,7 @@ class SensorOrientationWindow(StagedView):
         self.opened = False
 
     def delete(self):
+        FrameUpdateScheduler.cancel(self)
         dpg.delete_item(self.edited_handler)
         dpg.delete_item(self.visible_handler)
         self.grid.clear()
@@ -723,8 +750,91 @@ class SensorOrientationWindow(StagedView):
         return super().delete()
 
 
+class StreamingHealthWindow(StagedView):
+    """
+    Displays how well streaming data is being received from the sensor,
+    such as dropped samples, gaps, and the jitter between samples
+    """
+
+    REFRESH_PERIOD = 0.5
+
+    def __init__(self, device: ThreespaceDevice):
+        self.device = device
+        self.last_refresh = 0
+        with dpg.stage(label="Streaming Health Stage") as self._stage_id:
+            with dpg.child_window():
+                with dpg.group(horizontal=True):
+                    self.reset_button = dpg.add_button(label="Reset", callback=self.__on_reset)
+                    dpg.add_text("Statistics are collected any time the sensor is streaming, including while logging.")
+                dpg.add_separator()
+                with dpg.table(width=-1, header_row=False):
+                    dpg.add_table_column(init_width_or_weight=200, width_fixed=True)
+                    dpg.add_table_column()
+                    self.value_texts = {}
+                    for label in ["Received", "Expected", "Dropped", "Duration", "Interval", "Timestamp Source", 
+                                  "Gaps", "Missing From Gaps", "Largest Gap", "Checksum Failures", "Resyncs"]:
+                        with dpg.table_row():
+                            dpg.add_text(f"{label}:")
+                            self.value_texts[label] = dpg.add_text()
+                dpg.add_spacer(height=12)
+                dpg.add_text("Jitter (Deviation from interval):")
+                with dpg.table(width=-1, header_row=False) as self.jitter_table:
+                    dpg.add_table_column(init_width_or_weight=200, width_fixed=True)
+                    dpg.add_table_column()
+
+            with dpg.item_handler_registry(label="Streaming Health Visible Handler") as self.visible_handler:
+                dpg.add_item_visible_handler(callback=self.__on_visible)
+            dpg.bind_item_handler_registry(self.reset_button, self.visible_handler)
+        
+        self.jitter_texts = []
+
+    def __on_visible(self):
+        if time.perf_counter() - self.last_refresh < self.REFRESH_PERIOD: return
+        self.last_refresh = time.perf_counter()
+        self.refresh()
+
+    def __on_reset(self):
+        self.device.reset_streaming_health()
+        self.refresh()
+
+    def refresh(self):
+        metrics = self.device.get_streaming_health()
+        interval = "N/A" if metrics.interval is None else f"{metrics.interval}us ({1_000_000 / metrics.interval:.1f}hz)"
+        values = {
+            "Received": metrics.received,
+            "Expected": metrics.expected,
+            "Dropped": f"{metrics.dropped} ({metrics.drop_percent:.2f}%)",
+            "Duration": f"{metrics.duration:.1f}s",
+            "Interval": interval,
+            "Timestamp Source": metrics.timestamp_source or "None (Using host time)",
+            "Gaps": metrics.num_gaps,
+            "Missing From Gaps": metrics.missing_from_gaps,
+            "Largest Gap": f"{metrics.largest_gap}us",
+            "Checksum Failures": metrics.checksum_failures,
+            "Resyncs": metrics.resyncs
+        }
+        for label, value in values.items():
+            dpg.set_value(self.value_texts[label], str(value))
+        
+        #Bins are fixed, so only need to create the rows once
+        if len(self.jitter_texts) == 0:
+            for label in metrics.get_jitter_labels():
+                with dpg.table_row(parent=self.jitter_table):
+                    dpg.add_text(label)
+                    self.jitter_texts.append(dpg.add_text())
+        total = max(1, sum(metrics.jitter_histogram))
+        for text, count in zip(self.jitter_texts, metrics.jitter_histogram):
+            dpg.set_value(text, f"{count} ({100 * count / total:.1f}%)")
+
+    def notify_opened(self, old_view: StagedView):
+        self.refresh()
+
+    def delete(self):
+        dpg.delete_item(self.visible_handler)
+        return super().delete()
+
 import data_charts
-from gui.datachart_view import SensorDataWindowAsync, SensorDataWindow, StreamOption, dataChartPopoutWindow
+from gui.datachart_view import SensorDataWindowAsync, SensorDataWindow, StreamOption, ChartPopoutHost
 
 class SensorDataChartsWindow(StagedView):
 
@@ -925,19 +1035,23 @@ class SensorDataChartsWindow(StagedView):
             popout.delete()
         return super().delete()
 
-import multiprocessing
-import multiprocessing.connection
+from device_streaming import StreamingReader, unwrap_timestamps
+from gui.chart_buffer import SharedChartRingBuffer
+from yostlabs.tss3.commands import threespace_command_get_info
 
 class DataChartPopoutWindowMain:
     X_SOURCE_TIMESTAMP = 0
     X_SOURCE_HEADER_TIMESTAMP = 1
     X_SOURCE_INDEX = 2
 
+    SHARED_CAPACITY = 4096 #Rows the popout can fall behind before samples are lost
+
     def __init__(self, device: ThreespaceDevice, default_selections: list[list[tuple[StreamOption,int]]]):
         self.selections = default_selections
-        self.process = None
+        self.popout_id: int = None
         self.device = device
-        self.conn: multiprocessing.connection.Connection = None
+        self.stream_reader: StreamingReader = None
+        self.shared_buffer: SharedChartRingBuffer = None
 
         self.deleted = False
 
@@ -949,37 +1063,42 @@ class DataChartPopoutWindowMain:
                 if stream_option not in self.streaming_options:
                     self.streaming_options.append(stream_option)
 
+        #The samples are sent as rows of X followed by the values of every option
+        self.shared_layout: list[tuple[ThreespaceStreamingOption,int,int]] = []
+        self.num_shared_columns = 1
+        for option in self.streaming_options:
+            num_out = threespace_command_get_info(option.cmd.value).num_out_params
+            self.shared_layout.append((option, self.num_shared_columns, num_out))
+            self.num_shared_columns += num_out
+
     def streaming_callback(self, status: ThreespaceStreamingStatus):
-        if status == ThreespaceStreamingStatus.Data:
+        if status == ThreespaceStreamingStatus.DataEnd:
+            snapshot = self.stream_reader.poll()
+            if len(snapshot) == 0: return
+
             #Get X from dynamic timestamp source
             if self.x_source in (self.X_SOURCE_HEADER_TIMESTAMP, self.X_SOURCE_TIMESTAMP):
                 if self.x_source == self.X_SOURCE_TIMESTAMP:
-                    timestamp = self.device.get_streaming_value(StreamableCommands.GetTimestamp)
+                    timestamps = snapshot.get(StreamableCommands.GetTimestamp)
                 else:
-                    timestamp = self.device.get_streaming_last_response().header.timestamp
-                    if timestamp is None: #Something disabled the header timestamp without notifying the data charts
-                        self.unregister_streaming()
-                        return
-        
-                #Handle Wrapping of timestamp
-                if self.last_timestamp is not None and timestamp < self.last_timestamp:
-                    if self.last_timestamp < 0xFFFFFFFF:
-                        self.timestamp_offset += 0xFFFFFFFF #U32 timestamp wrap
-                    else:
-                        self.timestamp_offset += 0xFFFFFFFFFFFFFFFF #U64 timestamp wrap
-                self.last_timestamp = timestamp
-                timestamp += self.timestamp_offset
-                x = timestamp / 1_000_000
+                    timestamps = snapshot.header_timestamps
+                if timestamps is None: #Something disabled the timestamp without notifying the data charts
+                    self.unregister_streaming()
+                    return
+                timestamps, self.last_timestamp, self.timestamp_offset = unwrap_timestamps(timestamps, self.last_timestamp, self.timestamp_offset)
+                x = timestamps / 1_000_000
             else:
-                x = self.cur_index
-                self.cur_index += 1
-
-            for option in self.streaming_options:
-                data = self.device.get_streaming_value(option.cmd, option.param)
+                x = np.arange(self.cur_index, self.cur_index + len(snapshot), dtype=np.float64)
+                self.cur_index += len(snapshot)
+
+            #Write all the options as rows to the shared buffer, then tell the data window to do the draws
+            rows = np.full((len(snapshot), self.num_shared_columns), np.nan)
+            rows[:,0] = x
+            for option, column, num_out in self.shared_layout:
+                data = snapshot.get(option)
                 if data is not None:
-                    self.send_point(option, x, data)
-        elif status == ThreespaceStreamingStatus.DataEnd:
-            #Tell the data window to do the draws
+                    rows[:,column:column+num_out] = data.reshape(len(snapshot), num_out)
+            self.shared_buffer.write(rows)
             self.send_update()
         elif status == ThreespaceStreamingStatus.Reset:
             self.unregister_streaming()
@@ -1011,8 +1130,10 @@ class DataChartPopoutWindowMain:
             self.last_timestamp = None
             self.timestamp_offset = 0
             self.cur_index = 0
+            self.shared_buffer.restart()
             self.device.update_streaming_settings()
-            self.device.register_streaming_callback(self.streaming_callback, 100)
+            self.stream_reader = self.device.open_streaming_reader()
+            self.device.register_streaming_callback(self.streaming_callback, 100, batch_only=True)
             self.set_max_points((1_000_000 / self.device.get_streaming_interval()) * 5)
         except Exception as e:
             self.device.report_error(e)
@@ -1023,6 +1144,7 @@ class DataChartPopoutWindowMain:
         try:
             self.device.unregister_all_streaming_commands_from_owner(self, True)
             self.device.unregister_streaming_callback(self.streaming_callback)
+            self.device.close_streaming_reader(self.stream_reader)
         except Exception as e:
             self.device.report_error(e)
             return False
@@ -1031,32 +1153,15 @@ class DataChartPopoutWindowMain:
 
         return True
 
-    def send_point(self, option: ThreespaceStreamingOption, x: int|float, y: int|float|list):
-        try:
-            self.conn.send(("point", option, x, y))
-        except BrokenPipeError as e:
-            self.delete()
-        except OSError as e: pass
-
     def send_update(self):
-        try:
-            self.conn.send(("update", self.x_source != self.X_SOURCE_INDEX))
-        except BrokenPipeError as e:
-            self.delete()
-        except OSError as e: pass
+        ChartPopoutHost.send("update", self.popout_id, self.x_source != self.X_SOURCE_INDEX)
 
     def set_max_points(self, num_points: int):
-        try:
-            self.conn.send(("max", num_points))
-        except BrokenPipeError as e:
-            self.delete()
-        except OSError as e: pass
+        ChartPopoutHost.send("max", self.popout_id, num_points)
 
     def spawn(self):
-        parent_conn, child_conn = multiprocessing.Pipe()
-        self.conn = parent_conn
-        self.process = multiprocessing.Process(target=dataChartPopoutWindow, args=(self.device.name,self.selections,child_conn), daemon=True)
-        self.process.start()
+        self.shared_buffer = SharedChartRingBuffer.create(self.SHARED_CAPACITY, self.num_shared_columns)
+        self.popout_id = ChartPopoutHost.open_popout(self.device.name, self.selections, self.shared_buffer.name, self.shared_layout, on_closed=self.delete)
 
         self.register_streaming()
 
@@ -1064,12 +1169,11 @@ class DataChartPopoutWindowMain:
         if self.deleted:
             return
         self.deleted = True
-        self.process.terminate()
-        self.process.join(timeout=1)
-        self.process.close()
+        ChartPopoutHost.close_popout(self.popout_id)
         self.unregister_streaming()
-        if self.conn != None:
-            self.conn.close()
+        if self.shared_buffer is not None:
+            self.shared_buffer.close()
+            self.shared_buffer = None
 
 class TableMatrix:
 
@@ -1904,6 +2008,7 @@ class GradientDescentCalibrationWizard:
         self.__cached_axis_order: str = None
         self.__cached_axis_offset_enabled: bool = None
         self.gathering = False
+        self.stream_reader: StreamingReader = None
     
     def get_result(self):
         return self.result
@@ -1991,7 +2096,8 @@ class GradientDescentCalibrationWizard:
         #Only gather data when button is pressed
         #This is to prevent situations where streaming gets backed up due to slow device not being able to parse 500Hz
         self.device.pause_streaming(self)
-        self.device.register_streaming_callback(self.__on_sample_received, min_hz)
+        self.stream_reader = self.device.open_streaming_reader()
+        self.device.register_streaming_callback(self.__on_sample_received, min_hz, batch_only=True)
         self.device.update_streaming_settings()
 
         #Switch the window style to the gradient descent gathering
@@ -2078,14 +2184,13 @@ class GradientDescentCalibrationWizard:
 
     def __on_sample_received(self, status: ThreespaceStreamingStatus):
         if not self.gathering: return
-        if status == ThreespaceStreamingStatus.Data:
+        if status == ThreespaceStreamingStatus.DataEnd:
+            snapshot = self.stream_reader.poll()
             for accel in self.accel_samples:
-                self.accel_totals[accel] += np.array(self.device.get_streaming_value(StreamableCommands.GetRawAccelVec, accel), dtype=np.float64)
+                self.accel_totals[accel] += snapshot.get(StreamableCommands.GetRawAccelVec, accel).sum(axis=0)
             for mag in self.mag_samples:
-                self.mag_totals[mag] += np.array(self.device.get_streaming_value(StreamableCommands.GetRawMagVec, mag), dtype=np.float64)
-            self.num_readings += 1
-        elif status == ThreespaceStreamingStatus.DataEnd:
-            pass
+                self.mag_totals[mag] += snapshot.get(StreamableCommands.GetRawMagVec, mag).sum(axis=0)
+            self.num_readings += len(snapshot)
         elif status == ThreespaceStreamingStatus.Reset:
             self.device.unregister_all_streaming_commands_from_owner(self)
             self.__on_config_cancel_button()
@@ -2096,6 +2201,7 @@ class GradientDescentCalibrationWizard:
 
         self.device.resume_streaming(self)
         self.device.update() #To remove any old readings
+        self.stream_reader.skip()
         self.num_readings = 0
         
         #Wait for getting atleast READINGS_PER_SAMPLE readings
@@ -2189,6 +2295,7 @@ class GradientDescentCalibrationWizard:
         try:
             #Stop streaming
             self.device.unregister_streaming_callback(self.__on_sample_received)
+            self.device.close_streaming_reader(self.stream_reader)
             self.device.unregister_all_streaming_commands_from_owner(self)
             self.device.resume_streaming(self)
 
@@ -2289,6 +2396,7 @@ class SphereCalibrationWizard:
         self.__cached_axis_order: str = None
         self.__cached_axis_offset_enabled = None
         self.gathering = False 
+        self.stream_reader: StreamingReader = None
 
         self.__configure_gathering()
     
@@ -2319,21 +2427,25 @@ class SphereCalibrationWizard:
         self.gathered_orients = { mag: [] for mag in mags }
         self.display_mag = mags[0]
 
-        self.device.register_streaming_callback(self.__on_sample_received, hz=100)
+        self.stream_reader = self.device.open_streaming_reader()
+        self.device.register_streaming_callback(self.__on_sample_received, hz=100, batch_only=True)
         self.device.update_streaming_settings()
         self.wizard_stage = SphereCalibrationWizard.GATHERING
         self.gathering = True
 
     def __on_sample_received(self, status: ThreespaceStreamingStatus):
         if not self.gathering: return
-        if status == ThreespaceStreamingStatus.Data:
+        if status == ThreespaceStreamingStatus.DataEnd:
+            snapshot = self.stream_reader.poll()
+            if len(snapshot) == 0: return
+            orients = snapshot.get(StreamableCommands.GetUntaredOrientation)
             for mag in self.calibrators:
-                sample = self.device.get_streaming_value(StreamableCommands.GetRawMagVec, mag)
-                if self.calibrators[mag].process_point(sample):
-                    self.gathered_orients[mag].append(self.device.get_streaming_value(StreamableCommands.GetUntaredOrientation))             
-        elif status == ThreespaceStreamingStatus.DataEnd:
-            quat = self.device.get_streaming_value(StreamableCommands.GetUntaredOrientation)
-            self.last_mag = self.device.get_streaming_value(StreamableCommands.GetRawMagVec, self.display_mag)
+                samples = snapshot.get(StreamableCommands.GetRawMagVec, mag)
+                for sample, orient in zip(samples, orients):
+                    if self.calibrators[mag].process_point(sample):
+                        self.gathered_orients[mag].append(orient.tolist())
+            quat = orients[-1].tolist()
+            self.last_mag = snapshot.get(StreamableCommands.GetRawMagVec, self.display_mag)[-1].tolist()
             self.render_quat(quat)
             dpg.set_value(self.sample_text, str(self.calibrators[self.display_mag].num_points))
             dpg.set_value(self.sparsity_text, f"{(self.calibrators[self.display_mag].largest_delta):<5.1f}")
@@ -2361,6 +2473,7 @@ class SphereCalibrationWizard:
     def restore_settings(self):
         try:
             self.device.unregister_streaming_callback(self.__on_sample_received)
+            self.device.close_streaming_reader(self.stream_reader)
             self.device.unregister_all_streaming_commands_from_owner(self)
 
             if self.__cached_axis_order is not None:
@@ -2564,6 +2677,7 @@ class BootloaderTerminalWindow(StagedView):
         except Exception as e:
             self.device.report_error(e)
 
+    @FrameProfiler.timed("Terminal Read")
     def __read_terminal(self):
         data = self.device.read_com_port(decode=False)
         if len(data) > 0:
@@ -2642,12 +2756,13 @@ class EeptsWindow(StagedView):
         self.mapping_enabled = False
 
     def streaming_callback(self, status: ThreespaceStreamingStatus):
-        if status == ThreespaceStreamingStatus.Data:
-            out = yleepts.YL_EEPTS_OUTPUT_DATA(*self.device.get_streaming_value(StreamableCommands.GetEeptsOldestStep))
-            if self.last_segment is None or out.segment_count != self.last_segment.segment_count:
-                self.add_point(out)
-        elif status == ThreespaceStreamingStatus.DataEnd:
-            pass
+        if status == ThreespaceStreamingStatus.DataEnd:
+            steps = self.stream_reader.poll().get(StreamableCommands.GetEeptsOldestStep)
+            if steps is None: return
+            for step in steps:
+                out = yleepts.YL_EEPTS_OUTPUT_DATA(*step.tolist())
+                if self.last_segment is None or out.segment_count != self.last_segment.segment_count:
+                    self.add_point(out)
         elif status == ThreespaceStreamingStatus.Reset:
             self.stop_mapping()
 
@@ -2669,7 +2784,8 @@ class EeptsWindow(StagedView):
 
             self.mapping_enabled = self.device.register_streaming_command(self, StreamableCommands.GetEeptsOldestStep, immediate_update=False)
             if not self.mapping_enabled: return
-            self.device.register_streaming_callback(self.streaming_callback, hz=3) #Do not need to stream very fast for EEPTS. Just needs to be max expected steps per second
+            self.stream_reader = self.device.open_streaming_reader()
+            self.device.register_streaming_callback(self.streaming_callback, hz=3, batch_only=True) #Do not need to stream very fast for EEPTS. Just needs to be max expected steps per second
             self.device.update_streaming_settings()
         except Exception as e:
             self.stop_mapping()
@@ -2682,6 +2798,7 @@ class EeptsWindow(StagedView):
         try:
             self.device.unregister_streaming_command(self, StreamableCommands.GetEeptsOldestStep, immediate_update=False)
             self.device.unregister_streaming_callback(self.streaming_callback)
+            self.device.close_streaming_reader(self.stream_reader)
             self.device.update_streaming_settings()
 
             self.device.stop_eepts()
@@ -4,6 +4,7 @@ from typing import Any
 from gui.setting_gui.setting_structures import DpgSetting
 from gui.setting_gui.setting_structures_custom import *
 from yostlabs.tss3 import ThreespaceSensor
+from devices import ThreespaceSettingsTransaction
 from gui.core_ui import DpgWizard, DpgWizardPageBasic
 
 from gui.setting_gui.setting_structures import DpgSettingMenu
@@ -542,9 +543,7 @@ class DataLoggingConfigWizard(DpgWizard):
         self.cancel()
 
     def __restore_initial_settings(self):
-        for key, value in self.initial_tracked_values.items():
-            try:
-                self.sensor.write_settings(**{key: value})
-            except Exception:
-                pass
+        transaction = ThreespaceSettingsTransaction(self.sensor)
+        transaction.update(**self.initial_tracked_values)
+        transaction.commit()
 
@@ -14,6 +14,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 import data_charts  # For loading stream/log slot options from the sensor
+from devices import ThreespaceSettingsTransaction
 
 INVALID_FIELD_THEME = None
 INVALID_SECTION_THEME = None
@@ -188,7 +189,11 @@ class DpgSetting:
         try:
             err, num_successes = sensor.write_settings(**{self.descriptor.key: self.get_value()})
         except:
-            err = -256
+            err = ThreespaceSettingsTransaction.ERR_NOT_SENT
+        return self.apply_result(err, cache_value=cache_value)
+
+    def apply_result(self, err: int, cache_value: bool = True):
+        """Update the field state from the result of writing this setting, such as from a batched write."""
         self.mark_invalid(err != 0)
         if not err and cache_value:
             self.cache_value()
@@ -593,14 +598,24 @@ class DpgSettingMenu:
             self._on_section_state_changed(name)
 
     def apply_all(self, dirty_only: bool = True, cache_values: bool = True) -> bool:
-        """Write all (or only dirty) settings to the sensor."""
+        """Write all (or only dirty) settings to the sensor.
+        
+        The settings are written together in as few commands as possible, rather than one at a time.
+        """
+        transaction = ThreespaceSettingsTransaction(self.sensor)
+        for setting in self.settings:
+            if dirty_only and not setting.is_dirty():
+                continue
+            transaction.set(setting.descriptor.key, setting.get_value())
+        results = transaction.commit()
+
         all_success = True
         for name, section in self.sections.items():
             section.all_valid = True
             for setting in section.settings:
-                if dirty_only and not setting.is_dirty():
+                if setting.descriptor.key not in results:
                     continue
-                success = setting.apply(self.sensor, cache_value=cache_values)
+                success = setting.apply_result(results[setting.descriptor.key], cache_value=cache_values)
                 if not success:
                     print(f"Failed to apply setting: {setting.descriptor.key} in section {name}")
                 all_success = all_success and success
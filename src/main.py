@@ -1,4 +1,6 @@
 if __name__ == "__main__":
+    import time
+    startup_time = time.perf_counter()
     import multiprocessing
     multiprocessing.freeze_support()
 
@@ -17,7 +19,9 @@ if __name__ == "__main__":
     from gui.main_menubar import MenuBar
     import gui.resources.theme_lib as theme_lib, gui.resources.texture_lib as texture_lib
     from gui.resources.obj_lib import ObjectLibrary
-    import time
+    from utility import StartupProfiler
+    StartupProfiler.start(startup_time)
+    StartupProfiler.mark("Imports")
 
     #Get initial window size based on the monitor information obtained from GLFW
     width_per_height_ratio = 1280 / 815
@@ -78,6 +82,7 @@ if __name__ == "__main__":
                         height=viewport_height,
                         x_pos=viewport_x,
                         y_pos=viewport_y)
+    StartupProfiler.mark("Viewport")
 
     theme_lib.init()
     texture_lib.init()
@@ -86,16 +91,20 @@ if __name__ == "__main__":
     image_root = RESOURCE_FOLDER / "images" / "fdialog"
     print(f"{image_root=}")
     FileDialog.set_image_root(image_root.as_posix() + "/")
+    StartupProfiler.mark("Themes and textures")
 
-    from utility import Logger, MainLoopEventQueue
+    from utility import Logger, MainLoopEventQueue, FrameUpdateScheduler, MainLoopIdleScheduler, FrameProfiler
     Logger.init()
     from gui.core_ui import FontManager, set_primary_window_cached
     GL_Context.init()
+    StartupProfiler.mark("GL context")
     ObjectLibrary.init()
+    StartupProfiler.mark("Default model")
 
     FontManager.init()
     dpg.bind_font(FontManager.DEFAULT_FONT)
     GL_Context.default_font = Font((FONT_FOLDER / "FiraCode-Regular.ttf").as_posix())
+    StartupProfiler.mark("Fonts")
 
     #Create Window Structures and connections
     with dpg.window(label="Main Window") as primary_window:
@@ -124,6 +133,7 @@ if __name__ == "__main__":
     general_manager.load_main_window()
 
     set_primary_window_cached(primary_window)
+    StartupProfiler.mark("Main window")
 
     dpg.set_viewport_min_height(550)
     dpg.set_viewport_min_width(586)
@@ -132,6 +142,7 @@ if __name__ == "__main__":
     dpg.setup_dearpygui()
     dpg.set_viewport_vsync(False)
     dpg.show_viewport()
+    StartupProfiler.mark("Show viewport")
 
     #TEMPORARY - The bleak_util.allow_sta() should be all that is needed, however
     #that appears to not fully work on Windows 11, Windows 10 it does. This does fix problems
@@ -144,8 +155,16 @@ if __name__ == "__main__":
     #or errors are thrown, the app won't crash as it tries to modify and uninitialized UI
     dpg.configure_app(manual_callback_management=True)
     dpg.set_frame_callback(2, general_manager.device_manager.discover_devices)
+
+    #Start the chart popout process in the background so popouts open instantly
+    from gui.datachart_view import ChartPopoutHost
+    dpg.set_frame_callback(3, ChartPopoutHost.start)
+
+    #Load the rest of the sensor models in the background once the UI is up
+    dpg.set_frame_callback(4, ObjectLibrary.startPrewarm)
     last_update_time = time.time()
     MAX_FPS = 120
+    IDLE_FPS = 30 #Used once there has been no input or visual updates for a while
 
     #Try except is for if application is not ran with PyInstaller bootloader
     try:
@@ -159,21 +178,38 @@ if __name__ == "__main__":
     #handler thread. This provides a way for the main thread to schedule DPG calls that will be executed
     #from that thread
     def on_visible(unused):
-        MainLoopEventQueue.process_dpg_events()
+        with FrameProfiler.section("DPG Events"):
+            MainLoopEventQueue.process_dpg_events()
 
     with dpg.item_handler_registry() as visible_handler:
         dpg.add_item_visible_handler(callback=on_visible)
     dpg.bind_item_handler_registry(primary_window, visible_handler)
 
+    #Any input brings the frame rate back up from idle
+    with dpg.handler_registry() as activity_handler:
+        dpg.add_mouse_move_handler(callback=MainLoopIdleScheduler.notify_activity)
+        dpg.add_mouse_click_handler(callback=MainLoopIdleScheduler.notify_activity)
+        dpg.add_mouse_wheel_handler(callback=MainLoopIdleScheduler.notify_activity)
+        dpg.add_key_press_handler(callback=MainLoopIdleScheduler.notify_activity)
+
+    if platform.system() == 'Windows':
+        #The main loop sleeps between updates, which Windows rounds up to its timer resolution of 15.6ms by default
+        import ctypes
+        ctypes.windll.winmm.timeBeginPeriod(1)
+
     last_render_time = time.perf_counter()
     while dpg.is_dearpygui_running():
         start_time = time.time()
-        general_manager.device_manager.update()
+        with FrameProfiler.section("Device Update"):
+            general_manager.device_manager.update()
         end_time = time.time()
         elapsed_time = end_time - start_time
         if elapsed_time > 0.1:
             print("Long update time:", elapsed_time)
-        general_manager.logger_manager.update()
+        with FrameProfiler.section("Logger Update"):
+            general_manager.logger_manager.update()
+        with FrameProfiler.section("Chart Popouts"):
+            ChartPopoutHost.update()
         
         #To avoid threading issues, running callbacks here
         #This is supposedly slower, but I don't feel like wrapping
@@ -190,19 +226,37 @@ if __name__ == "__main__":
         #cancel_callback on file_dialog
         #all global/item handler callbacks via dpg.handler_registry/dpg.item_handler_registry
         #https://github.com/hoffstadt/DearPyGui/issues/2208
-        MainLoopEventQueue.process_sync_events()
-        dpg.run_callbacks(jobs) #I am not actually sure this is safe anymore because of the issue related to the visible_handler
-
+        with FrameProfiler.section("Sync Events"):
+            MainLoopEventQueue.process_sync_events()
+        if len(jobs) > 0 or len(FrameUpdateScheduler.pending) > 0:
+            MainLoopIdleScheduler.notify_activity()
+        with FrameProfiler.section("Callbacks"):
+            dpg.run_callbacks(jobs) #I am not actually sure this is safe anymore because of the issue related to the visible_handler
+
+        frame_interval = 1 / (IDLE_FPS if MainLoopIdleScheduler.is_idle() else MAX_FPS)
         cur_time = time.perf_counter()
-        if cur_time - last_render_time > 1 / MAX_FPS:
-            dpg.render_dearpygui_frame()
+        if cur_time - last_render_time >= frame_interval:
+            with FrameProfiler.section("Frame Updates"):
+                FrameUpdateScheduler.flush() #Visual updates requested since the last frame
+            with FrameProfiler.section("Render"):
+                dpg.render_dearpygui_frame()
             last_render_time = cur_time
+            if StartupProfiler.start_time is not None:
+                StartupProfiler.finish("First frame")
+
+        #Sleep until the next frame, unless the devices or another thread need the loop sooner
+        MainLoopIdleScheduler.request_wake_time(last_render_time + frame_interval)
+        with FrameProfiler.section("Sleep"):
+            MainLoopIdleScheduler.wait()
 
     #Cleanup anything needed before shutting down
     general_manager.cleanup()
+    ChartPopoutHost.cleanup()
     menu.cleanup()
     Logger.cleanup()
 
     #Shut down
+    if platform.system() == 'Windows':
+        ctypes.windll.winmm.timeEndPeriod(1)
     dpg.destroy_context()
     GL_Context.cleanup()
\ No newline at end of file
@@ -30,7 +30,7 @@ import serial.tools.list_ports
 
 import platform
 
-from utility import Logger, Callback
+from utility import Logger, Callback, MainLoopIdleScheduler, FrameProfiler
 import time
 
 import dataclasses
@@ -383,7 +383,12 @@ class ThreespaceManager:
         
         #Update all the sensors
         for group in self.devices.values():
-            group.device.update()
+            with FrameProfiler.section(f"Device Update: {group.device.name}"):
+                group.device.update()
+            #Run again around when the next sample should have arrived
+            interval = group.device.get_streaming_period_s()
+            if interval is not None:
+                MainLoopIdleScheduler.request_wake_time(time.perf_counter() + interval)
 
         #Clear any sensors that need removed
         for com in self.queued_for_removal:
@@ -402,3 +407,5 @@ class ThreespaceManager:
             #         to_disconnect.append(group.device.port)
             # for port in to_disconnect:
             #     self.remove_device_by_port(port)
+
+        MainLoopIdleScheduler.request_wake_time(time.perf_counter() + self.periodic_update_rate - (time.time() - self.last_update_time))
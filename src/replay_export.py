@@ -0,0 +1,150 @@
+"""
+Renders the orientation of a recorded data file to image files without any visible window.
+Frames are rendered offscreen as fast as the GPU (or software GL) allows instead of being
+tied to the UI frame rate, so this is used to create review videos from logs.
+
+Can be run directly, for example:
+    python replay_export.py settings.cfg data.bin output_folder --fps 30
+The frames can then be combined with any video tool, such as
+    ffmpeg -framerate 30 -i output_folder/frame_%06d.png video.mp4
+"""
+from yostlabs.graphics import GL_Context, ModelObject, TextureRenderer, OBJ
+from yostlabs.graphics.scene_prefabs import OrientationScene
+from yostlabs.tss3.api import StreamableCommands
+from yostlabs.math.axes import AxisOrder
+
+from data_file import TssDataFile, TssDataFileSettings, ThreespaceStreamingOption
+
+from OpenGL.GL import *
+import numpy as np
+import PIL.Image
+
+from pathlib import Path
+from typing import Callable
+import time
+
+ORIENTATION_SOURCES = (
+    ThreespaceStreamingOption(StreamableCommands.GetTaredOrientation, None),
+    ThreespaceStreamingOption(StreamableCommands.GetUntaredOrientation, None)
+)
+
+FORMAT_PNG = "png"
+FORMAT_RAW = "raw" #Unencoded RGBA8, top row first
+
+class OrientationReplayExporter:
+    """
+    Renders each output frame of a data file's orientation into an offscreen framebuffer.
+    GL_Context must be initialized first, it is hidden unless told otherwise.
+    NOTE: Must be used from the thread that owns the GL context
+    """
+
+    def __init__(self, data_file: TssDataFile, model: OBJ, width: int, height: int, axis_order: AxisOrder = None):
+        self.data_file = data_file
+        self.width = width
+        self.height = height
+        self.axis_order = axis_order or data_file.settings.axis_order_info or AxisOrder("xyz")
+
+        self.orientation_source = next((source for source in ORIENTATION_SOURCES if source in data_file.settings.stream_slots), None)
+        if self.orientation_source is None:
+            raise ValueError("Data file does not contain an orientation")
+
+        self.renderer = TextureRenderer(width, height)
+        self.scene = OrientationScene(width, height, model=ModelObject(model=model), font=GL_Context.default_font)
+        self.scene.camera.set_perspective(aspect_ratio=width/height)
+        self.scene.set_axis_order(self.axis_order)
+
+    def get_frame_indices(self, fps: float):
+        """The sample index shown in each output frame"""
+        if self.data_file.has_monotime: #Monotime is in seconds
+            frame_times = np.arange(0, self.data_file.get_monotime(-1), 1 / fps)
+            return [max(0, self.data_file.monotime_to_index(t)) for t in frame_times]
+        #No timestamps, so assume samples were evenly spaced at the logged rate
+        data_hz = self.data_file.settings.data_hz
+        if not data_hz:
+            raise ValueError("Data file has no timestamps and its settings have no data rate, the rate must be supplied (--hz)")
+        num_frames = int(len(self.data_file) / data_hz * fps)
+        return [min(len(self.data_file) - 1, int(i * data_hz / fps)) for i in range(num_frames)]
+
+    def render_frame(self, index: int) -> np.ndarray:
+        """Returns the frame for the given sample as a (height, width, 4) uint8 array, top row first"""
+        self.scene.set_model_rotation_quat(self.data_file.get_value(index, self.orientation_source))
+        with self.renderer:
+            self.scene.render()
+            pixels = glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE)
+        pixels = np.frombuffer(pixels, dtype=np.uint8).reshape(self.height, self.width, 4)
+        return pixels[::-1]
+
+    def export(self, folder: Path, fps: float, format: str = FORMAT_PNG, progress_callback: Callable[[int,int],bool|None] = None):
+        """
+        Writes frame_000000.png (or .raw) and so on to the folder.
+        progress_callback is called with (frames_written, total_frames) after each frame, returning False cancels the export.
+        Returns the number of frames written.
+        """
+        if format not in (FORMAT_PNG, FORMAT_RAW):
+            raise ValueError(f"Unknown export format {format}")
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+
+        indices = self.get_frame_indices(fps)
+        last_index = None
+        for frame_num, index in enumerate(indices):
+            if index != last_index: #When the output fps is above the data rate, frames repeat
+                frame = self.render_frame(index)
+                last_index = index
+            path = folder / f"frame_{frame_num:06d}.{format}"
+            if format == FORMAT_PNG:
+                PIL.Image.fromarray(frame, "RGBA").save(path, compress_level=1)
+            else:
+                path.write_bytes(frame.tobytes())
+            if progress_callback is not None and progress_callback(frame_num + 1, len(indices)) is False:
+                return frame_num + 1
+        return len(indices)
+
+    def destroy(self):
+        self.scene.destroy()
+        self.renderer.destroy()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Export the orientation of a data file as image frames without opening a window")
+    parser.add_argument("config", type=Path, help="The settings.cfg created alongside the data file")
+    parser.add_argument("data", type=Path, help="The .csv or .bin data file")
+    parser.add_argument("output", type=Path, help="Folder to write the frames to")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--hz", type=float, default=None, help="Rate the data was recorded at, only used when the data file has no timestamps. Defaults to the rate in the config")
+    parser.add_argument("--width", type=int, default=1200)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--format", choices=(FORMAT_PNG, FORMAT_RAW), default=FORMAT_PNG)
+    parser.add_argument("--model", default=None, help="Name of the sensor model to display, defaults to the default model")
+    args = parser.parse_args()
+
+    from managers.resource_manager import FONT_FOLDER
+    from gui.resources.obj_lib import ObjectLibrary
+    from yostlabs.graphics import Font
+
+    settings = TssDataFileSettings.from_config_file(args.config)
+    if args.hz is not None:
+        settings.data_hz = args.hz
+    data_file = TssDataFile(args.data, settings)
+    data_file.load_data()
+    data_file.compute_monotime(divider=1_000_000, start_at_zero=True) #Same as the replay windows
+
+    GL_Context.init(visible=False)
+    GL_Context.default_font = Font((FONT_FOLDER / "FiraCode-Regular.ttf").as_posix())
+    ObjectLibrary.init()
+    model = ObjectLibrary.getObjFromModelName(args.model or ObjectLibrary.getDefaultModelName())
+
+    exporter = OrientationReplayExporter(data_file, model, args.width, args.height)
+    start_time = time.perf_counter()
+    def print_progress(written: int, total: int):
+        if written % 50 != 0 and written != total: return
+        elapsed = time.perf_counter() - start_time
+        print(f"\r{written}/{total} frames ({written / elapsed:.1f} fps)", end="", flush=True)
+    try:
+        exporter.export(args.output, args.fps, args.format, print_progress)
+        print()
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        exporter.destroy()
+        GL_Context.cleanup()
@@ -697,6 +697,20 @@ class Axis(_GridComponent, Iterable[Slot], Sized):
             self._slots.pop(index)
 
 
+def _axis_layout_key(axis: Axis):
+    def _float_key(value: float):
+        return None if value != value else value  # NaN -> None
+
+    return (
+        _float_key(axis._spacing),
+        axis._padding.tobytes(),
+        tuple(
+            (slot._size, slot._weight, _float_key(slot._spacing), slot._padding.tobytes())
+            for slot in axis
+        ),
+    )
+
+
 @dataclasses.dataclass(init=False)
 class Grid(_GridComponent):
     """Layout manager for Dear PyGui, emulating a table-like structure.
@@ -800,6 +814,9 @@ class Grid(_GridComponent):
         '_item_data',
         '_trashbin',
         '_drawlayer',
+        '_layout_key',
+        '_layout_version',
+        '_skipped_relayouts',
         # configuration
         'rows',
         'cols',
@@ -897,6 +914,10 @@ class Grid(_GridComponent):
         self._trashbin  = set()
         self._lock      = threading.Lock() if not sys.gettrace() else threading.RLock()
 
+        self._layout_key        = None
+        self._layout_version    = 0
+        self._skipped_relayouts = 0
+
         self.cols = Axis(0, label='x')
         self.rows = Axis(0, label='y')
 
@@ -918,6 +939,8 @@ class Grid(_GridComponent):
         #   * updating the grid's settings
         #   * updating `self._item_data`
         #   * drawing the grid
+        if self._trashbin:
+            self._layout_version += 1
         self._item_data.difference_update(self._trashbin)
         self._trashbin.clear()
 
@@ -995,6 +1018,7 @@ class Grid(_GridComponent):
                 self._show = show
 
             super().configure(**kwargs)
+            self._layout_version += 1
             self._clean_cache()
 
     def configuration(self):
@@ -1042,6 +1066,7 @@ class Grid(_GridComponent):
                     if not "Item not found" in str(e):
                         raise e
             self._trashbin.update(self._item_data)
+            self._layout_version += 1
             self._clean_cache()
 
             dearpygui.delete_item(self._drawlayer, children_only=False)
@@ -1253,8 +1278,45 @@ class Grid(_GridComponent):
                 is_text=is_text,
             )
             self._item_data.add(item_data)
+            self._layout_version += 1
             return item_data
 
+    @property
+    def skipped_relayouts(self) -> int:
+        """[get] Return the number of draw events that were skipped because
+        nothing affecting the layout changed since the previous draw."""
+        return self._skipped_relayouts
+
+    def invalidate(self):
+        """Force the next draw event to recalculate and reposition all
+        attached items, even if the layout appears unchanged."""
+        self._layout_key = None
+
+    def _get_layout_key(self, area_rect: tuple):
+        # Everything a draw event depends on. Slots can be configured directly
+        # without going through the grid, so their settings are included rather
+        # than tracked. Arrays are compared as bytes since NaN != NaN.
+        text_sizes = []
+        for item_data in self._item_data:
+            if item_data.is_text:
+                try:
+                    text_sizes.append(tuple(_item_get_state(item_data.item)['rect_size']))
+                except SystemError:
+                    text_sizes.append(None)
+        return (
+            area_rect,
+            self._layout_version,
+            self._width,
+            self._height,
+            self._offsets.tobytes(),
+            self._padding.tobytes(),
+            self._spacing.tobytes(),
+            self._overlay,
+            _axis_layout_key(self.cols),
+            _axis_layout_key(self.rows),
+            tuple(text_sizes),
+        )
+
     def _upd_slot_states(self, axis: Axis, area_size: float, index_offset: Literal[0, 1]):  # XXX: performance-sensitive
         area_c1_pad  = self._offsets[0 + index_offset]
         area_c2_pad  = self._offsets[2 + index_offset]
@@ -1580,6 +1642,12 @@ class Grid(_GridComponent):
             )
 
             if self._show and area_visible:
+                layout_key = self._get_layout_key((_area_width, _area_height, area_x_pos, area_y_pos))
+                if layout_key == self._layout_key:
+                    self._skipped_relayouts += 1
+                    return
+                self._layout_key = layout_key
+
                 area_width = self._width or _area_width
                 self._upd_slot_states(self.cols, area_width, 0)
                 area_height = self._height or _area_height
@@ -1611,6 +1679,7 @@ class Grid(_GridComponent):
                         (150, 255, 255, 80),
                     )
             else:
+                self._layout_key = None
                 _item_set_config(self._drawlayer, show=False)
 
 
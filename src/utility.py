@@ -265,10 +265,12 @@ class MainLoopEventQueue:
     @staticmethod
     def queue_sync_event(event: FunctionType):
         MainLoopEventQueue.sync_events.put(event)
+        MainLoopIdleScheduler.wake()
 
     @staticmethod
     def queue_dpg_event(event: FunctionType):
         MainLoopEventQueue.dpg_events.put(event)
+        MainLoopIdleScheduler.wake()
 
     @staticmethod
     def process_sync_events():
@@ -298,8 +300,249 @@ class MainLoopEventQueue:
         jobs = dpg.get_callback_queue()
         MainLoopEventQueue.process_sync_events()
         dpg.run_callbacks(jobs)
+        FrameUpdateScheduler.flush()
         dpg.render_dearpygui_frame()
 
+from typing import Any
+import time
+class FrameUpdateScheduler:
+    """
+    Coalesces visual updates that can be requested many times between rendered frames,
+    such as charts receiving streaming data, so each one only runs once per frame.
+    flush is called right before rendering a frame. If the updates take longer than the frame
+    budget, the remaining updates are left for the following frames, oldest first.
+    request and cancel may be called from any thread, such as from DPG handlers. The updates always run on the main thread.
+    """
+
+    pending: dict[Any,tuple[Callable,tuple]] = {}
+    lock = threading.Lock()
+    frame_budget = 0.008 #Seconds, None for no limit
+
+    @staticmethod
+    def request(key: Any, update: Callable, *args):
+        """
+        Request update be called before the next frame. Requests with a key that is already
+        pending replace the args but keep their place in line.
+        """
+        with FrameUpdateScheduler.lock:
+            FrameUpdateScheduler.pending[key] = (update, args)
+
+    @staticmethod
+    def cancel(key: Any):
+        with FrameUpdateScheduler.lock:
+            FrameUpdateScheduler.pending.pop(key, None)
+
+    @staticmethod
+    def flush():
+        pending = FrameUpdateScheduler.pending
+        if len(pending) == 0: return
+        budget = FrameUpdateScheduler.frame_budget
+        start_time = time.perf_counter()
+        with FrameUpdateScheduler.lock:
+            keys = list(pending.keys())
+        for key in keys:
+            #The lock is not held while updating so updates can request again
+            with FrameUpdateScheduler.lock:
+                if key not in pending: continue #Cancelled by an earlier update
+                update, args = pending.pop(key)
+            with FrameProfiler.section(f"Frame Update: {type(key).__name__}"):
+                update(*args)
+            #Always do at least one update so a slow update can't stall the rest
+            if budget is not None and time.perf_counter() - start_time > budget:
+                break
+
+class MainLoopIdleScheduler:
+    """
+    Lets the main loop sleep until the next thing it needs to do instead of spinning.
+    Each iteration, anything with work due at a known time calls request_wake_time, and wait
+    sleeps until the earliest of those. Other threads call wake to end the sleep early,
+    queuing an event on the MainLoopEventQueue already does this.
+
+    The loop is considered active while the user is interacting or visual updates are pending.
+    Once idle for idle_delay seconds, the main loop renders at its idle frame rate instead.
+    """
+
+    wake_event = threading.Event()
+    next_wake_time: float = None #perf_counter time
+    max_sleep = 0.1 #Seconds, checks are still done this often even if nothing requested it
+    idle_delay = 1 #Seconds
+    last_active_time = time.perf_counter()
+
+    @staticmethod
+    def request_wake_time(wake_time: float):
+        """Request the main loop run again by the given time.perf_counter() time"""
+        if MainLoopIdleScheduler.next_wake_time is None or wake_time < MainLoopIdleScheduler.next_wake_time:
+            MainLoopIdleScheduler.next_wake_time = wake_time
+
+    @staticmethod
+    def wake():
+        """Thread safe, ends the current or next wait"""
+        MainLoopIdleScheduler.wake_event.set()
+
+    @staticmethod
+    def notify_activity():
+        MainLoopIdleScheduler.last_active_time = time.perf_counter()
+
+    @staticmethod
+    def is_idle():
+        return time.perf_counter() - MainLoopIdleScheduler.last_active_time > MainLoopIdleScheduler.idle_delay
+
+    @staticmethod
+    def wait():
+        """Sleep until the earliest requested wake time, then clear the requests for the next iteration"""
+        timeout = MainLoopIdleScheduler.max_sleep
+        if MainLoopIdleScheduler.next_wake_time is not None:
+            timeout = min(timeout, MainLoopIdleScheduler.next_wake_time - time.perf_counter())
+        MainLoopIdleScheduler.next_wake_time = None
+        if timeout > 0:
+            MainLoopIdleScheduler.wake_event.wait(timeout)
+        #Anything that woke this was queued before now, so it is handled by this iteration
+        MainLoopIdleScheduler.wake_event.clear()
+
+class StartupProfiler:
+    """
+    Records how long each phase of startup takes. Each mark ends the phase that
+    started at the previous mark, finish prints the table and stops recording.
+    """
+
+    start_time: float = None
+    last_time: float = None
+    phases: list[tuple[str,float]] = []
+
+    @staticmethod
+    def start(start_time: float = None):
+        StartupProfiler.start_time = start_time if start_time is not None else time.perf_counter()
+        StartupProfiler.last_time = StartupProfiler.start_time
+        StartupProfiler.phases.clear()
+
+    @staticmethod
+    def mark(phase: str):
+        if StartupProfiler.start_time is None: return
+        cur_time = time.perf_counter()
+        StartupProfiler.phases.append((phase, cur_time - StartupProfiler.last_time))
+        StartupProfiler.last_time = cur_time
+
+    @staticmethod
+    def finish(phase: str):
+        if StartupProfiler.start_time is None: return
+        StartupProfiler.mark(phase)
+        total = StartupProfiler.last_time - StartupProfiler.start_time
+        width = max(len("Total"), *(len(name) for name, _ in StartupProfiler.phases))
+        print("Startup Profile:")
+        for name, duration in StartupProfiler.phases:
+            print(f"  {name:<{width}} {duration * 1000:8.1f}ms")
+        print(f"  {'Total':<{width}} {total * 1000:8.1f}ms")
+        StartupProfiler.start_time = None
+
+from collections import deque
+import contextlib
+import functools
+import json
+import os
+
+class FrameProfiler:
+    """
+    Times sections of the main loop and callbacks while enabled. Keeps the most recent
+    durations of each section for statistics, and every recorded section for exporting
+    as a Chrome trace (chrome://tracing or https://ui.perfetto.dev).
+    Sections may be recorded from any thread and may be nested.
+    """
+
+    enabled = False
+    history_size = 1000 #Durations kept per section
+    max_trace_events = 200_000
+
+    #Name -> (start, duration) in perf_counter seconds
+    sections: dict[str,deque[tuple[float,float]]] = {}
+    trace_events: deque[tuple[str,float,float,int]] = deque(maxlen=max_trace_events)
+
+    class Section:
+        __slots__ = ("name", "start")
+
+        def __init__(self, name: str):
+            self.name = name
+
+        def __enter__(self):
+            self.start = time.perf_counter()
+
+        def __exit__(self, exc_type, exc_value, exc_traceback):
+            FrameProfiler.record(self.name, self.start, time.perf_counter() - self.start)
+
+    NULL_SECTION = contextlib.nullcontext()
+
+    @staticmethod
+    def section(name: str):
+        """Context manager that records the time spent in it under name"""
+        if not FrameProfiler.enabled: return FrameProfiler.NULL_SECTION
+        return FrameProfiler.Section(name)
+
+    @staticmethod
+    def timed(name: str):
+        """Decorator that records every call of the function under name"""
+        def decorator(func: Callable):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not FrameProfiler.enabled: return func(*args, **kwargs)
+                with FrameProfiler.Section(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def record(name: str, start: float, duration: float):
+        history = FrameProfiler.sections.get(name, None)
+        if history is None:
+            history = FrameProfiler.sections.setdefault(name, deque(maxlen=FrameProfiler.history_size))
+        history.append((start, duration))
+        FrameProfiler.trace_events.append((name, start, duration, threading.get_ident()))
+
+    @staticmethod
+    def set_enabled(enabled: bool):
+        FrameProfiler.enabled = enabled
+
+    @staticmethod
+    def reset():
+        FrameProfiler.sections.clear()
+        FrameProfiler.trace_events.clear()
+
+    @staticmethod
+    def get_durations(name: str, period: float = None) -> list[float]:
+        """Recorded durations of the section, limited to those started in the last period seconds if given"""
+        history = list(FrameProfiler.sections.get(name, ()))
+        if period is not None:
+            cutoff = time.perf_counter() - period
+            history = [sample for sample in history if sample[0] >= cutoff]
+        return [duration for _, duration in history]
+
+    @staticmethod
+    def get_stats(period: float = 1) -> list[tuple[str,int,float,float,float,float]]:
+        """
+        Returns (name, calls, mean, p95, max, load) for each section over the last period seconds, highest load first.
+        Times are in seconds, load is the fraction of the period spent in the section.
+        """
+        stats = []
+        for name in list(FrameProfiler.sections.keys()):
+            durations = FrameProfiler.get_durations(name, period)
+            if len(durations) == 0: continue
+            durations.sort()
+            p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            total = sum(durations)
+            stats.append((name, len(durations), total / len(durations), p95, durations[-1], total / period))
+        stats.sort(key=lambda stat: stat[5], reverse=True)
+        return stats
+
+    @staticmethod
+    def export_chrome_trace(path: pathlib.Path):
+        """Writes every recorded section still kept in the Chrome trace event format"""
+        pid = os.getpid()
+        events = [{ "name": name, "ph": "X", "ts": start * 1_000_000, "dur": duration * 1_000_000, "pid": pid, "tid": tid }
+                  for name, start, duration, tid in list(FrameProfiler.trace_events)]
+        thread_names = { thread.ident: thread.name for thread in threading.enumerate() }
+        for tid in { event["tid"] for event in events }:
+            events.append({ "name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": { "name": thread_names.get(tid, str(tid)) } })
+        with open(path, 'w') as file:
+            json.dump({ "traceEvents": events, "displayTimeUnit": "ms" }, file)
+
 #Used to allow to_dict to also get values from @property variables
 #as well as load a class from that same dict setting the associated property variables.
 #It does that in addition to working with the base dictionary features from dataclasses